@@ -10,6 +10,14 @@ sys.stdout.reconfigure(encoding="utf-8", errors="replace")
 from copilot import CopilotClient
 
 
+def _event_type(event) -> str:
+    """Resolve an SDK event's type string without a per-event hasattr()."""
+    try:
+        return event.type.value
+    except AttributeError:
+        return str(event.type)
+
+
 async def test_basic():
     """Test 1: Basic SDK connection and model listing."""
     print("=" * 60)
@@ -37,7 +45,7 @@ async def test_basic():
     response = []
 
     def on_event(event):
-        etype = event.type.value if hasattr(event.type, "value") else str(event.type)
+        etype = _event_type(event)
         if etype == "assistant.message":
             response.append(event.data.content or "")
         elif etype in ("session.idle", "session.error"):
@@ -73,7 +81,7 @@ async def test_with_tools():
 
     tools = build_tools(repo_path, git_ops=git_ops, knowledge_graph=kg)
     print(f"Tools registered: {len(tools)}")
-    tool_names = [t.name if hasattr(t, "name") else str(t) for t in tools]
+    tool_names = [getattr(t, "name", None) or str(t) for t in tools]
     print(f"  {tool_names}")
 
     client = CopilotClient({"use_logged_in_user": True})
@@ -98,7 +106,7 @@ async def test_with_tools():
     errors = []
 
     def on_event(event):
-        etype = event.type.value if hasattr(event.type, "value") else str(event.type)
+        etype = _event_type(event)
         if etype == "assistant.message_delta":
             delta = event.data.delta_content or ""
             response_parts.append(delta)
@@ -155,4 +163,11 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run = asyncio.run
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            run = uvloop.run
+        except ModuleNotFoundError:
+            pass
+    run(main())
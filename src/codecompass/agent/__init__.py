@@ -8,6 +8,7 @@ from codecompass.agent.prompts import (
     STALE_DOCS_PROMPT,
     WHY_QUERY_PROMPT,
     get_onboarding_prompt,
+    get_onboarding_prompt_batch,
 )
 
 __all__ = [
@@ -16,6 +17,7 @@ __all__ = [
     "CodeCompassAgent",
     "CONTRIBUTOR_PROMPT",
     "get_onboarding_prompt",
+    "get_onboarding_prompt_batch",
     "ONBOARDING_SYSTEM_PROMPT",
     "STALE_DOCS_PROMPT",
     "WHY_QUERY_PROMPT",
@@ -4,9 +4,13 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
 from typing import Any
 
+from codecompass import __version__
 from codecompass.agent.prompts import (
     ARCHITECTURE_PROMPT,
     CONTRIBUTOR_PROMPT,
@@ -15,9 +19,11 @@ from codecompass.agent.prompts import (
     WHY_QUERY_PROMPT,
     get_onboarding_prompt,
 )
+from codecompass.github.git import GitOps, GitOpsError
 from codecompass.indexer.knowledge_graph import KnowledgeGraph
 from codecompass.indexer.scanner import RepoScanner
 from codecompass.models import RepoSummary
+from codecompass.utils.cache import load_cached, store_cached
 from codecompass.utils.config import Settings
 
 logger = logging.getLogger(__name__)
@@ -44,6 +50,21 @@ _MODE_PROMPTS: dict[str, str] = {
 }
 
 
+# Bump when pickled RepoSummary/KnowledgeGraph attributes change
+_CACHE_SCHEMA = 2
+
+# Shared worker pool for ``settings.parallel_index`` graph builds
+_PROCESS_POOL: ProcessPoolExecutor | None = None
+
+
+def _process_pool() -> ProcessPoolExecutor:
+    """Return the process pool used for parallel graph builds."""
+    global _PROCESS_POOL
+    if _PROCESS_POOL is None:
+        _PROCESS_POOL = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _PROCESS_POOL
+
+
 class CodeCompassAgent:
     """Orchestrates the CodeCompass intelligence pipeline.
 
@@ -64,27 +85,69 @@ class CodeCompassAgent:
         settings: Settings | None = None,
     ) -> None:
         self.repo_path = Path(repo_path).resolve()
+        self._repo_str = str(self.repo_path)
         self.settings = settings or Settings.load()
         self._summary: RepoSummary | None = None
         self._graph: KnowledgeGraph | None = None
+        self._cache_key: str | None = None
+        self._cache_key_resolved = False
+        self._system_messages: dict[str, dict[str, str]] = {}
+        self._graph_build: asyncio.Future[KnowledgeGraph] | None = None
 
     # ── lazy initializers ────────────────────────────────────────────
 
+    def _repo_cache_key(self) -> str | None:
+        """Return the on-disk cache key for the repo's current state.
+
+        Only clean git checkouts are cacheable: uncommitted edits do not
+        move ``HEAD`` and would otherwise be served stale results.
+        """
+        if not self._cache_key_resolved:
+            self._cache_key_resolved = True
+            try:
+                git = GitOps(self.repo_path)
+                sha = git.head_sha()
+                if sha and git.is_clean():
+                    self._cache_key = f"{__version__}.{_CACHE_SCHEMA}-{sha}"
+            except GitOpsError:
+                pass
+        return self._cache_key
+
     def _ensure_scanned(self) -> RepoSummary:
         if self._summary is None:
-            scanner = RepoScanner(
-                self.repo_path,
-                max_file_size_kb=self.settings.max_file_size_kb,
-                tree_depth=self.settings.tree_depth,
-            )
-            self._summary = scanner.scan()
-            logger.info("Repo scanned: %s", self._summary.name)
+            key = self._repo_cache_key()
+            if key:
+                key = f"{key}-{self.settings.max_file_size_kb}-{self.settings.tree_depth}"
+                self._summary = load_cached(self.repo_path, "summary", key)
+            if self._summary is None:
+                scanner = RepoScanner(
+                    self.repo_path,
+                    max_file_size_kb=self.settings.max_file_size_kb,
+                    tree_depth=self.settings.tree_depth,
+                )
+                # Line counting is I/O-bound, so threads help despite the GIL
+                workers = min(32, (os.cpu_count() or 1) * 4)
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    self._summary = scanner.scan(executor=pool)
+                if key:
+                    store_cached(self.repo_path, "summary", key, self._summary)
+            # The onboarding message embeds the summary text
+            self._system_messages.clear()
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Repo scanned: %s", self._summary.name)
         return self._summary
 
     def _ensure_graph(self) -> KnowledgeGraph:
         if self._graph is None:
-            self._graph = KnowledgeGraph()
-            self._graph.build(self.repo_path)
+            key = self._repo_cache_key()
+            graph = load_cached(self.repo_path, "graph", key) if key else None
+            if graph is None:
+                graph = KnowledgeGraph()
+                executor = _process_pool() if self.settings.parallel_index else None
+                graph.build(self.repo_path, executor=executor)
+                if key:
+                    store_cached(self.repo_path, "graph", key, graph)
+            self._graph = graph
         return self._graph
 
     # ── public API ───────────────────────────────────────────────────
@@ -102,14 +165,35 @@ class CodeCompassAgent:
     def system_message(self, mode: str = AgentMode.ONBOARDING) -> dict[str, str]:
         """Build the system message dict for a given *mode*.
 
-        For ``ONBOARDING`` mode the repo summary is injected.
+        For ``ONBOARDING`` mode the repo summary is injected.  Messages are
+        memoized per mode for the lifetime of the scanned summary.
         """
+        cached = self._system_messages.get(mode)
+        if cached is not None:
+            return cached
+
         if mode == AgentMode.ONBOARDING:
             summary = self._ensure_scanned()
-            return get_onboarding_prompt(summary.to_text())
-
-        prompt = _MODE_PROMPTS.get(mode, ONBOARDING_SYSTEM_PROMPT)
-        return {"content": prompt}
+            message = get_onboarding_prompt(summary.to_text())
+        else:
+            message = {"content": _MODE_PROMPTS.get(mode, ONBOARDING_SYSTEM_PROMPT)}
+        self._system_messages[mode] = message
+        return message
+
+    async def scan(self) -> RepoSummary:
+        """Scan the repo and start building the graph in the background.
+
+        Returns as soon as the summary is ready so callers can render it
+        while the graph builds; ``await onboard()`` before using
+        :attr:`graph`.
+        """
+        summary = self._ensure_scanned()
+        if self._graph is None and self._graph_build is None:
+            loop = asyncio.get_running_loop()
+            # Graph building needs no context variables, so skip the
+            # copy_context() that asyncio.to_thread() would add.
+            self._graph_build = loop.run_in_executor(None, self._ensure_graph)
+        return summary
 
     async def onboard(self) -> RepoSummary:
         """Run the onboarding pipeline: scan + build graph.
@@ -117,9 +201,12 @@ class CodeCompassAgent:
         Returns:
             The ``RepoSummary`` for the repository.
         """
-        summary = self._ensure_scanned()
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self._ensure_graph)
+        summary = await self.scan()
+        if self._graph_build is not None:
+            try:
+                await self._graph_build
+            finally:
+                self._graph_build = None
         return summary
 
     async def ask(self, question: str) -> dict[str, Any]:
@@ -129,7 +216,7 @@ class CodeCompassAgent:
         """
         mode = AgentMode.ASK
         lower_q = question.lower().strip()
-        if lower_q.startswith("why ") or lower_q.startswith("why?"):
+        if lower_q.startswith(("why ", "why?")):
             mode = AgentMode.WHY
 
         sys_msg = self.system_message(mode)
@@ -144,19 +231,16 @@ class CodeCompassAgent:
         self._ensure_graph()
         sys_msg = self.system_message(AgentMode.ARCHITECTURE)
 
-        modules = self.graph.all_modules()
-        module_list = "\n".join(f"- {m}" for m in modules[:50])
-        context = (
-            f"## Indexed Modules\n\n{module_list}\n\n"
-            f"Total import edges: {len(self.graph.imports)}"
-        )
+        modules = self.graph.all_modules()[:50]
+        module_list = "- " + "\n- ".join(modules) if modules else ""
 
         return {
             "system_message": sys_msg,
             "user_message": {
                 "content": (
                     "Please analyze the architecture of this repository.\n\n"
-                    + context
+                    f"## Indexed Modules\n\n{module_list}\n\n"
+                    f"Total import edges: {self.graph.import_count}"
                 )
             },
         }
@@ -166,27 +250,31 @@ class CodeCompassAgent:
         summary = self._ensure_scanned()
         sys_msg = self.system_message(AgentMode.STALE_DOCS)
 
+        repo_root = self._repo_str
+        prefix_len = len(os.path.join(repo_root, ""))
         doc_files: list[str] = []
-        for p in self.repo_path.iterdir():
-            if p.suffix.lower() in {".md", ".rst"} and p.is_file():
-                doc_files.append(p.name)
-
-        docs_dir = self.repo_path / "docs"
-        if docs_dir.is_dir():
-            for p in docs_dir.rglob("*.md"):
-                rel = p.relative_to(self.repo_path).as_posix()
-                if rel not in doc_files:
-                    doc_files.append(rel)
+        with os.scandir(repo_root) as entries:
+            for entry in entries:
+                if entry.name.lower().endswith((".md", ".rst")) and entry.is_file():
+                    doc_files.append(entry.name)
+
+        # Top-level names never contain "/", so docs/ paths cannot collide
+        for dirpath, _dirnames, filenames in os.walk(os.path.join(repo_root, "docs")):
+            # os.walk() yields paths under repo_root, so slicing is a relpath
+            rel_dir = dirpath[prefix_len:].replace(os.sep, "/")
+            doc_files.extend(f"{rel_dir}/{name}" for name in filenames if name.endswith(".md"))
+
+        file_list = (
+            "- " + "\n- ".join(doc_files) if doc_files else "- (no documentation files found)"
+        )
 
-        file_list = "\n".join(f"- {f}" for f in doc_files) or "- (no documentation files found)"
+        header = (
+            "Please audit the documentation freshness for this repo.\n\n"
+            f"## Documentation Files\n\n{file_list}\n\n"
+            "## Repo Summary\n\n"
+        )
 
         return {
             "system_message": sys_msg,
-            "user_message": {
-                "content": (
-                    "Please audit the documentation freshness for this repo.\n\n"
-                    f"## Documentation Files\n\n{file_list}\n\n"
-                    f"## Repo Summary\n\n{summary.to_text()}"
-                )
-            },
+            "user_message": {"content": "".join(chain((header,), summary.to_text_iter()))},
         }
@@ -7,6 +7,9 @@ integrating custom tools and system prompts for codebase intelligence.
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
+import io
 import logging
 from pathlib import Path
 from typing import Any, Callable
@@ -17,6 +20,64 @@ from codecompass.agent.tools import build_tools
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for the session to go idle after sending a prompt
+_RESPONSE_TIMEOUT = 60
+
+
+# ── event handlers (keyed by SDK event type) ─────────────────────────
+
+
+def _handle_message_delta(active: dict[str, Any], data: Any) -> None:
+    delta = getattr(data, "delta_content", "") or ""
+    if delta:
+        active["response_parts"].write(delta)
+        cb = active.get("on_delta")
+        if cb:
+            cb(delta)
+
+
+def _handle_message(active: dict[str, Any], data: Any) -> None:
+    active["full_response"].append(getattr(data, "content", "") or "")
+
+
+def _handle_session_error(active: dict[str, Any], data: Any) -> None:
+    error_msg = (
+        getattr(data, "message", None)
+        or getattr(data, "error", None)
+        or "Unknown SDK session error"
+    )
+    active["error"] = str(error_msg)
+    active["done"].set()
+
+
+def _handle_session_idle(active: dict[str, Any], data: Any) -> None:
+    active["done"].set()
+
+
+def _expire_request(collector: dict[str, Any]) -> None:
+    """Timer callback: flag *collector* as timed out and wake its waiter."""
+    collector["timed_out"] = True
+    collector["done"].set()
+
+
+def _abandon_request(collector: dict[str, Any], token: object, _result: Any) -> None:
+    """Done callback of a caller's future: stop waiting if it gave up.
+
+    *token* identifies the send the callback was registered for, so a
+    callback that runs late never touches a later request.
+    """
+    if collector["token"] is token:
+        collector["abandoned"] = True
+        collector["done"].set()
+
+
+_EVENT_HANDLERS: dict[str, Callable[[dict[str, Any], Any], None]] = {
+    "assistant.message_delta": _handle_message_delta,
+    "assistant.message": _handle_message,
+    "session.error": _handle_session_error,
+    "session.idle": _handle_session_idle,
+}
+
 
 class CompassClient:
     """High-level wrapper around the Copilot SDK client.
@@ -52,13 +113,21 @@ class CompassClient:
         self._client: CopilotClient | None = None
         self._session: Any = None
         self._active_request: dict[str, Any] | None = None
-        self._request_lock = asyncio.Lock()
-        self._tools = build_tools(
-            repo_path,
-            git_ops=git_ops,
-            knowledge_graph=knowledge_graph,
-            github_client=github_client,
-        )
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pending: asyncio.Queue[tuple[str, Any, asyncio.Future[Any]]] | None = None
+        self._dispatcher: asyncio.Task[None] | None = None
+        self._collector: dict[str, Any] = {
+            "done": None,
+            "response_parts": io.StringIO(),
+            "full_response": [],
+            "error": None,
+            "timed_out": False,
+            "abandoned": False,
+            "token": None,
+            "on_delta": None,
+        }
+        # Built on first create_session(), once the graph may be attached
+        self._tools: list[Any] | None = None
 
     # ── lifecycle ────────────────────────────────────────────────────
 
@@ -77,12 +146,27 @@ class CompassClient:
         else:
             opts["use_logged_in_user"] = True
 
+        self._loop = asyncio.get_running_loop()
         self._client = CopilotClient(opts if opts else None)
         await self._client.start()
         logger.info("Copilot SDK client started")
 
     async def stop(self) -> None:
-        """Stop the Copilot SDK client and clean up."""
+        """Stop the Copilot SDK client and clean up.
+
+        Prompts still waiting for the dispatcher fail with ``RuntimeError``
+        instead of hanging their callers.
+        """
+        dispatcher, pending = self._dispatcher, self._pending
+        self._dispatcher = None
+        self._pending = None
+        if dispatcher is not None:
+            dispatcher.cancel()
+            if dispatcher.get_loop() is asyncio.get_running_loop():
+                with contextlib.suppress(asyncio.CancelledError):
+                    await dispatcher
+        if pending is not None:
+            self._fail_pending(pending)
         if self._session is not None:
             try:
                 await self._session.destroy()
@@ -101,6 +185,14 @@ class CompassClient:
     async def __aexit__(self, *exc: object) -> None:
         await self.stop()
 
+    def attach_knowledge_graph(self, knowledge_graph: Any) -> None:
+        """Give the tools of sessions created from now on *knowledge_graph*.
+
+        Lets callers build the graph while the client is starting.
+        """
+        self._knowledge_graph = knowledge_graph
+        self._tools = None
+
     # ── session management ───────────────────────────────────────────
 
     async def create_session(
@@ -129,6 +221,13 @@ class CompassClient:
                 pass
             self._active_request = None
 
+        if self._tools is None:
+            self._tools = build_tools(
+                self._repo_path,
+                git_ops=self._git_ops,
+                knowledge_graph=self._knowledge_graph,
+                github_client=self._github_client,
+            )
         config: dict[str, Any] = {
             "model": self._model,
             "streaming": streaming,
@@ -139,47 +238,187 @@ class CompassClient:
 
         self._session = await self._client.create_session(config)
         self._session.on(self._on_event)
-        logger.info("Session created with model=%s, streaming=%s", self._model, streaming)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Session created with model=%s, streaming=%s", self._model, streaming)
         return self._session
 
+    async def switch_model(
+        self,
+        model: str,
+        *,
+        system_message: dict[str, str] | None = None,
+        streaming: bool = True,
+    ) -> Any:
+        """Switch to *model* by replacing the current session.
+
+        The model is a per-session setting, so the running SDK client is
+        kept and only a new session is created.
+
+        Args:
+            model: LLM model identifier to switch to.
+            system_message: Optional system message for the new session.
+            streaming: Whether to enable streaming responses.
+
+        Returns:
+            The new SDK session object.
+        """
+        self._model = model
+        return await self.create_session(system_message=system_message, streaming=streaming)
+
     def _on_event(self, event: Any) -> None:
         """Dispatch SDK events to the current in-flight request collector."""
         active = self._active_request
         if active is None:
             return
 
-        event_type = event.type.value if hasattr(event.type, "value") else str(event.type)
-        event_data = getattr(event, "data", None)
+        try:
+            # SDK events carry an Enum; the fast path avoids hasattr()
+            event_type = event.type.value
+        except AttributeError:
+            event_type = str(event.type)
 
-        if event_type == "assistant.message_delta":
-            delta = getattr(event_data, "delta_content", "") or ""
-            if delta:
-                active["response_parts"].append(delta)
-                cb = active.get("on_delta")
-                if cb:
-                    cb(delta)
-            return
+        handler = _EVENT_HANDLERS.get(event_type)
+        if handler is not None:
+            handler(active, getattr(event, "data", None))
 
-        if event_type == "assistant.message":
-            content = getattr(event_data, "content", "") or ""
-            active["full_response"].append(content)
-            return
+    # ── messaging ────────────────────────────────────────────────────
 
-        if event_type == "session.error":
-            error_msg = (
-                getattr(event_data, "message", None)
-                or getattr(event_data, "error", None)
-                or "Unknown SDK session error"
-            )
-            active["error"] = str(error_msg)
-            active["done"].set()
-            return
+    def _ensure_dispatcher(self) -> asyncio.Queue[tuple[str, Any, asyncio.Future[Any]]]:
+        """Return the pending-prompt queue, starting its dispatcher if needed.
 
-        if event_type == "session.idle":
-            active["done"].set()
-            return
+        The queue, dispatcher task, and the collector's ``done`` event are
+        bound to the running loop, so they are re-created when it changes.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._dispatcher is None or self._dispatcher.done():
+            self._loop = loop
+            self._collector["done"] = asyncio.Event()
+            self._pending = asyncio.Queue(maxsize=1)
+            self._dispatcher = loop.create_task(self._dispatch_loop(self._pending))
+        assert self._pending is not None
+        return self._pending
+
+    @staticmethod
+    def _fail_pending(
+        pending: asyncio.Queue[tuple[str, Any, asyncio.Future[Any]]],
+    ) -> None:
+        """Settle every prompt left in *pending* once its dispatcher is gone."""
+        while not pending.empty():
+            _prompt, _on_delta, result = pending.get_nowait()
+            if not result.done():
+                result.set_exception(RuntimeError("Client stopped"))
 
-    # ── messaging ────────────────────────────────────────────────────
+    async def _dispatch_loop(
+        self,
+        pending: asyncio.Queue[tuple[str, Any, asyncio.Future[Any]]],
+    ) -> None:
+        """Single session writer: send queued prompts one at a time.
+
+        Session events carry no request id, so only one prompt may be in
+        flight; later prompts wait in *pending* in FIFO order.
+        """
+        while True:
+            prompt, on_delta, result = await pending.get()
+            if result.done():
+                continue
+            try:
+                outcome = await self._send_one(prompt, on_delta, result)
+            except asyncio.CancelledError:
+                result.cancel()
+                raise
+            except Exception as exc:
+                if not result.done():
+                    result.set_exception(exc)
+            else:
+                if not result.done():
+                    result.set_result(outcome)
+
+    def _reset_collector(
+        self,
+        on_delta: Callable[[str], None] | None,
+    ) -> dict[str, Any]:
+        """Reset the reusable request collector for a new send.
+
+        Only the dispatcher calls this, so sends never overlap.
+        """
+        collector = self._collector
+        collector["done"].clear()
+        response_parts: io.StringIO = collector["response_parts"]
+        response_parts.seek(0)
+        response_parts.truncate()
+        collector["full_response"].clear()
+        collector["error"] = None
+        collector["timed_out"] = False
+        collector["abandoned"] = False
+        collector["on_delta"] = on_delta
+        return collector
+
+    async def _send_one(
+        self,
+        prompt: str,
+        on_delta: Callable[[str], None] | None,
+        result: asyncio.Future[Any],
+    ) -> tuple[str | None, str]:
+        """Send *prompt* and wait for the session to go idle.
+
+        Stops waiting early if the caller cancels *result*, so an
+        abandoned prompt does not hold up the ones queued behind it.
+
+        Returns:
+            ``(final_message, streamed_text)`` — *streamed_text* is only
+            filled in when no final ``assistant.message`` arrived.
+        """
+        collector = self._reset_collector(on_delta)
+        token = collector["token"] = object()
+        result.add_done_callback(functools.partial(_abandon_request, collector, token))
+        self._active_request = collector
+        loop = asyncio.get_running_loop()
+        timer = None
+        try:
+            await self._session.send({"prompt": prompt})
+            # A plain timer avoids the Task that asyncio.wait_for() would wrap around the wait
+            timer = loop.call_later(_RESPONSE_TIMEOUT, _expire_request, collector)
+            await collector["done"].wait()
+        finally:
+            if timer is not None:
+                timer.cancel()
+            collector["token"] = None
+            self._active_request = None
+
+        if collector["abandoned"]:
+            # Keep the rest of the abandoned response out of later requests
+            abort = getattr(self._session, "abort", None)
+            if abort is not None:
+                try:
+                    await abort()
+                except Exception as exc:
+                    logger.debug("Could not abort abandoned request: %s", exc)
+            raise RuntimeError("Request abandoned by caller")
+        if collector["timed_out"]:
+            raise RuntimeError("Timed out waiting for Copilot SDK response")
+        if collector["error"]:
+            raise RuntimeError(f"Copilot SDK session error: {collector['error']}")
+
+        full_response: list[str] = collector["full_response"]
+        if full_response:
+            return full_response[-1], ""
+        return None, collector["response_parts"].getvalue()
+
+    async def _submit(
+        self,
+        prompt: str,
+        on_delta: Callable[[str], None] | None,
+    ) -> tuple[str | None, str]:
+        """Queue *prompt* for the dispatcher and wait for its outcome."""
+        if self._session is None:
+            raise RuntimeError("No active session. Call create_session() first.")
+        pending = self._ensure_dispatcher()
+        result: asyncio.Future[tuple[str | None, str]] = asyncio.get_running_loop().create_future()
+        await pending.put((prompt, on_delta, result))
+        if pending is not self._pending:
+            # stop() ran while this caller waited for room in the queue
+            self._fail_pending(pending)
+        return await result
 
     async def send_and_collect(
         self,
@@ -196,33 +435,8 @@ class CompassClient:
         Returns:
             The complete assistant response text.
         """
-        if self._session is None:
-            raise RuntimeError("No active session. Call create_session() first.")
-        async with self._request_lock:
-            collector = {
-                "done": asyncio.Event(),
-                "response_parts": [],
-                "full_response": [],
-                "error": None,
-                "on_delta": on_delta,
-            }
-            self._active_request = collector
-            try:
-                await self._session.send({"prompt": prompt})
-                await asyncio.wait_for(collector["done"].wait(), timeout=60)
-            except asyncio.TimeoutError as exc:
-                raise RuntimeError("Timed out waiting for Copilot SDK response") from exc
-            finally:
-                self._active_request = None
-
-            if collector["error"]:
-                raise RuntimeError(f"Copilot SDK session error: {collector['error']}")
-
-            full_response: list[str] = collector["full_response"]
-            response_parts: list[str] = collector["response_parts"]
-            if full_response:
-                return full_response[-1]
-            return "".join(response_parts)
+        final, streamed = await self._submit(prompt, on_delta)
+        return final if final is not None else streamed
 
     async def send_streaming(
         self,
@@ -238,31 +452,9 @@ class CompassClient:
             on_delta: Callback for each streaming text chunk.
             on_done: Optional callback with the final complete response.
         """
-        if self._session is None:
-            raise RuntimeError("No active session. Call create_session() first.")
-        async with self._request_lock:
-            collector = {
-                "done": asyncio.Event(),
-                "response_parts": [],
-                "full_response": [],
-                "error": None,
-                "on_delta": on_delta,
-            }
-            self._active_request = collector
-            try:
-                await self._session.send({"prompt": prompt})
-                await asyncio.wait_for(collector["done"].wait(), timeout=60)
-            except asyncio.TimeoutError as exc:
-                raise RuntimeError("Timed out waiting for Copilot SDK response") from exc
-            finally:
-                self._active_request = None
-
-            if collector["error"]:
-                raise RuntimeError(f"Copilot SDK session error: {collector['error']}")
-
-            final_content: list[str] = collector["full_response"]
-            if on_done and final_content:
-                on_done(final_content[-1])
+        final, _ = await self._submit(prompt, on_delta)
+        if on_done and final is not None:
+            on_done(final)
 
     @property
     def has_session(self) -> bool:
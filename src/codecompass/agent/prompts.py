@@ -1,5 +1,12 @@
 """System prompts for the CodeCompass codebase intelligence and onboarding assistant."""
 
+import functools
+import logging
+import os
+import sys
+
+logger = logging.getLogger(__name__)
+
 ONBOARDING_SYSTEM_PROMPT: str = """\
 You are CodeCompass, a friendly and expert codebase guide specializing in \
 developer onboarding and codebase intelligence.
@@ -228,6 +235,61 @@ Prioritize findings by severity, presenting the most impactful issues first.\
 """
 
 
+# Static part of the onboarding message, built once at import time.  It
+# must stay byte-identical across repos and the repo summary must only
+# ever be appended after it: provider-side prompt caching matches on the
+# longest shared prefix, so interpolating anything dynamic here would
+# turn every session into a cache miss.
+_ONBOARDING_PREFIX: str = sys.intern(
+    f"{ONBOARDING_SYSTEM_PROMPT}\n\n"
+    "## Repository Context\n\n"
+    "The following summary was automatically generated for the "
+    "repository you are helping the user explore:\n\n"
+)
+
+
+# Upper bound on a built system prompt.  Oversized summaries (e.g. one that
+# accidentally embeds a file dump) fail locally instead of being rejected
+# by the model after the whole prompt has been sent.
+_DEFAULT_MAX_PROMPT_CHARS = 400_000
+
+
+def _max_prompt_chars() -> int:
+    """Read ``CODECOMPASS_MAX_PROMPT_CHARS``, ignoring invalid values."""
+    raw = os.environ.get("CODECOMPASS_MAX_PROMPT_CHARS")
+    if raw is None:
+        return _DEFAULT_MAX_PROMPT_CHARS
+    try:
+        value = int(raw)
+    except ValueError:
+        value = 0
+    if value <= 0:
+        logger.warning(
+            "Ignoring invalid CODECOMPASS_MAX_PROMPT_CHARS=%r; using %d",
+            raw,
+            _DEFAULT_MAX_PROMPT_CHARS,
+        )
+        return _DEFAULT_MAX_PROMPT_CHARS
+    return value
+
+
+MAX_PROMPT_CHARS = _max_prompt_chars()
+
+
+def _check_prompt_size(length: int) -> None:
+    if length > MAX_PROMPT_CHARS:
+        raise ValueError(
+            f"System prompt would be {length} characters, above the "
+            f"{MAX_PROMPT_CHARS}-character limit (CODECOMPASS_MAX_PROMPT_CHARS)"
+        )
+
+
+@functools.lru_cache(maxsize=16)
+def _onboarding_content(repo_summary: str) -> str:
+    """Return the full onboarding prompt text, reused for repeated summaries."""
+    return "".join((_ONBOARDING_PREFIX, repo_summary))
+
+
 def get_onboarding_prompt(repo_summary: str) -> dict[str, str]:
     """Build a system message dict for the onboarding agent.
 
@@ -242,12 +304,51 @@ def get_onboarding_prompt(repo_summary: str) -> dict[str, str]:
     Returns:
         A dict with a ``"content"`` key containing the full system prompt,
         ready to be passed to the model SDK as a system message.
+
+    Raises:
+        ValueError: If the prompt would exceed ``MAX_PROMPT_CHARS``.
+    """
+    _check_prompt_size(len(_ONBOARDING_PREFIX) + len(repo_summary))
+    return {"content": _onboarding_content(repo_summary)}
+
+
+# Most repository summaries accepted by get_onboarding_prompt_batch()
+MAX_ONBOARDING_BATCH = 16
+
+_ONBOARDING_BATCH_PREFIX: str = sys.intern(
+    f"{ONBOARDING_SYSTEM_PROMPT}\n\n"
+    "## Repository Context\n\n"
+    "The following summaries were automatically generated for the "
+    "repositories you are helping the user explore, each introduced by a "
+    "[repoN] marker:\n\n"
+)
+
+
+def get_onboarding_prompt_batch(repo_summaries: list[str]) -> dict[str, str]:
+    """Build one system message that onboards several repositories at once.
+
+    The static system prompt is sent a single time, followed by each
+    summary under a ``[repoN]`` marker, so N repositories cost one request
+    instead of N.
+
+    Args:
+        repo_summaries: Textual summaries, one per repository.
+
+    Returns:
+        A dict with a ``"content"`` key, like :func:`get_onboarding_prompt`.
+
+    Raises:
+        ValueError: If no summaries are given, more than
+            ``MAX_ONBOARDING_BATCH``, or the prompt would exceed
+            ``MAX_PROMPT_CHARS``.
     """
-    content = (
-        f"{ONBOARDING_SYSTEM_PROMPT}\n\n"
-        f"## Repository Context\n\n"
-        f"The following summary was automatically generated for the "
-        f"repository you are helping the user explore:\n\n"
-        f"{repo_summary}"
-    )
-    return {"content": content}
+    count = len(repo_summaries)
+    if not 0 < count <= MAX_ONBOARDING_BATCH:
+        raise ValueError(f"Expected 1 to {MAX_ONBOARDING_BATCH} repo summaries, got {count}")
+
+    parts = [_ONBOARDING_BATCH_PREFIX]
+    for i, summary in enumerate(repo_summaries, 1):
+        parts.append(f"[repo{i}]\n{summary}\n\n")
+    parts.append(f"Respond per repo using the markers [repo1]..[repo{count}] in order.")
+    _check_prompt_size(sum(map(len, parts)))
+    return {"content": "".join(parts)}
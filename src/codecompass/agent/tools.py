@@ -7,12 +7,26 @@ the GitHub API — all from within a conversation.
 
 from __future__ import annotations
 
+import asyncio
+import fnmatch
+import functools
+import json
 import logging
+import os
+import re
+import shutil
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
 from pydantic import BaseModel, Field
 
+from codecompass.indexer.scanner import RepoScanner
+
 logger = logging.getLogger(__name__)
 
 
@@ -70,6 +84,473 @@ class GetModuleDepsParams(BaseModel):
     module_name: str = Field(description="Dotted module name to inspect dependencies for")
 
 
+# ── File reading helpers ─────────────────────────────────────────────
+
+# read_source_file returns at most this many lines of an unranged read
+_READ_MAX_LINES = 300
+
+# Files up to this size are read whole; larger ones are streamed
+_READ_WHOLE_MAX_BYTES = 1 << 20
+
+
+def _iter_lines(f: Any) -> Iterator[str]:
+    """Yield the lines of text file *f* exactly as ``str.splitlines`` would."""
+    for chunk in f:
+        yield from chunk.splitlines()
+
+
+# Line boundaries str.splitlines() honours besides "\n" (text-mode reads
+# have already translated "\r" and "\r\n")
+_OTHER_LINE_BREAKS_RE = re.compile("[\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+def _head_and_count(content: str, max_lines: int) -> tuple[str | None, int]:
+    """Count the lines of *content* and, if over *max_lines*, cut its head.
+
+    Returns ``(head, total)`` where *head* is the first *max_lines* lines
+    joined by ``"\n"`` (``None`` when nothing is cut), matching what
+    ``str.splitlines`` would give without building the list of lines.
+    """
+    if _OTHER_LINE_BREAKS_RE.search(content):
+        lines = content.splitlines()
+        head = "\n".join(lines[:max_lines]) if len(lines) > max_lines else None
+        return head, len(lines)
+    total = content.count("\n") + (not content.endswith("\n") and bool(content))
+    if total <= max_lines:
+        return None, total
+    end = -1
+    for _ in range(max_lines):
+        end = content.find("\n", end + 1)
+    return content[:max(end, 0)], total
+
+
+# ── Code search helpers ──────────────────────────────────────────────
+
+# Directories search_code never descends into
+_SEARCH_SKIP_DIRS = frozenset(
+    {".git", "__pycache__", "node_modules", ".venv", "venv", "dist", "build"}
+)
+
+# Files above this size are not searched
+_SEARCH_MAX_FILE_BYTES = 512 * 1024
+
+# Fallback search threads, and files submitted to them per batch
+_SEARCH_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+_SEARCH_BATCH = 2 * _SEARCH_WORKERS
+
+
+@functools.lru_cache(maxsize=1)
+def _rg_executable() -> str | None:
+    """Return the path of the ``rg`` (ripgrep) binary, if installed."""
+    return shutil.which("rg")
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_file_pattern(file_pattern: str) -> re.Pattern[str]:
+    """Translate a ``search_code`` glob into one reusable regex.
+
+    Patterns containing ``/`` match the root-relative path, either from the
+    root or below any directory (as ``Path.rglob`` would); both forms are
+    OR'ed into a single regex.  Matching follows ``fnmatch.fnmatch``, so it
+    is case-insensitive where the platform's paths are.
+    """
+    flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+    if "/" not in file_pattern:
+        return re.compile(fnmatch.translate(file_pattern), flags)
+    return re.compile(
+        f"{fnmatch.translate(file_pattern)}|{fnmatch.translate('*/' + file_pattern)}", flags
+    )
+
+
+class _RepoListing:
+    """Snapshot of the files under a repository root, shared by the tools.
+
+    The tree is walked once with ``os.scandir`` -- directories in
+    ``_SEARCH_SKIP_DIRS`` are pruned before they are opened and symlinked
+    directories are not followed (as with ``Path.rglob``) -- keeping the
+    root-relative POSIX path of every file and the mtime of every
+    directory walked.  Later calls re-stat only those directories and
+    re-walk when one changed, i.e. when an entry was added, removed or
+    renamed.  File contents are not tracked; callers stat files they read.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._dirs: list[tuple[str, int]] = []
+        self._files: list[str] = []
+        self._file_set: set[str] | None = None
+        self._walked = False
+
+    def _is_current(self) -> bool:
+        if not self._walked:
+            return False
+        try:
+            return all(os.stat(d).st_mtime_ns == mtime for d, mtime in self._dirs)
+        except OSError:
+            return False
+
+    def _walk(self) -> None:
+        dirs: list[tuple[str, int]] = []
+        files: list[str] = []
+
+        def _visit(directory: str, rel_dir: str) -> None:
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+                with os.scandir(directory) as it:
+                    entries = list(it)
+            except OSError:
+                return
+            dirs.append((directory, mtime))
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _SEARCH_SKIP_DIRS:
+                            _visit(entry.path, f"{rel_dir}{entry.name}/")
+                    elif entry.is_file():
+                        files.append(rel_dir + entry.name)
+                except OSError:
+                    continue
+
+        _visit(str(self.root), "")
+        self._dirs, self._files, self._file_set = dirs, files, None
+        self._walked = True
+
+    def files(self) -> list[str]:
+        """Root-relative paths of all files, in walk order (do not mutate)."""
+        if not self._is_current():
+            self._walk()
+        return self._files
+
+    def file_set(self) -> set[str]:
+        """The same paths as :meth:`files`, as a set for membership tests."""
+        files = self.files()
+        if self._file_set is None:
+            self._file_set = set(files)
+        return self._file_set
+
+
+# One listing per repository root, shared by every build_tools() call
+_REPO_LISTINGS: dict[Path, _RepoListing] = {}
+
+
+def _repo_listing(root: Path) -> _RepoListing:
+    listing = _REPO_LISTINGS.get(root)
+    if listing is None:
+        listing = _REPO_LISTINGS[root] = _RepoListing(root)
+    return listing
+
+
+def _format_match(rel: str, line_no: int, line: str) -> str:
+    return f"- `{rel}:{line_no}`: {line.strip()[:120]}"
+
+
+async def _search_with_rg(
+    rg: str,
+    root: Path,
+    query: str,
+    file_pattern: str,
+    max_results: int,
+) -> list[str]:
+    """Case-insensitive literal search of *root* using ripgrep.
+
+    Mirrors :func:`_search_with_python`: hidden files and ignore files are
+    not special-cased, only ``_SEARCH_SKIP_DIRS`` and oversized files are
+    skipped.  The process is killed as soon as *max_results* matches have
+    been read.
+    """
+    limit = max(1, max_results)
+    argv = [
+        rg, "--json", "--fixed-strings", "--ignore-case", "--hidden", "--no-ignore",
+        "--max-filesize", str(_SEARCH_MAX_FILE_BYTES), "--max-count", str(limit),
+        "--glob", file_pattern,
+    ]
+    for name in sorted(_SEARCH_SKIP_DIRS):
+        argv += ["--glob", f"!{name}/"]
+    argv += ["--", query, "."]
+
+    proc = await asyncio.create_subprocess_exec(
+        *argv,
+        cwd=root,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+        limit=4 * 1024 * 1024,  # one JSON event per matched line
+    )
+    matches: list[str] = []
+    try:
+        assert proc.stdout is not None
+        async for raw in proc.stdout:
+            event = json.loads(raw)
+            if event.get("type") != "match":
+                continue
+            data = event["data"]
+            path = data["path"].get("text")
+            line = data["lines"].get("text")
+            if path is None or line is None:  # not valid UTF-8
+                continue
+            rel = path[2:] if path.startswith(("./", ".\\")) else path
+            matches.append(_format_match(rel.replace("\\", "/"), data["line_number"], line))
+            if len(matches) >= limit:
+                break
+    finally:
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+        await proc.wait()
+    return matches
+
+
+def _scan_file(
+    file_path: Path,
+    root: Path,
+    query: str,
+    limit: int,
+) -> list[str]:
+    """Return up to *limit* formatted matches of *query* in one file.
+
+    ASCII queries are located with ``bytes.find`` on the ASCII-lowercased
+    file bytes, so no regex is involved, and line numbers are only
+    computed for actual matches.  Other queries fall
+    back to a Unicode-aware scan of the decoded text.
+    """
+    try:
+        data = file_path.read_bytes()
+    except OSError:
+        return []
+
+    rel = file_path.relative_to(root).as_posix()
+    matches: list[str] = []
+
+    if not query.isascii():
+        pattern = re.compile(re.escape(query), re.IGNORECASE)
+        for i, line in enumerate(data.decode(errors="replace").splitlines(), 1):
+            if pattern.search(line):
+                matches.append(_format_match(rel, i, line))
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    needle = query.lower().encode()
+    lowered = data.lower()
+    if needle not in lowered:
+        return matches
+
+    # bytes.lower() only folds ASCII, so offsets in *lowered* are offsets in *data*
+    pos = counted = 0
+    line_no = 1
+    while len(matches) < limit:
+        start = lowered.find(needle, pos)
+        if start == -1 or start >= len(data):
+            break
+        line_no += data.count(b"\n", counted, start)
+        line_start = data.rfind(b"\n", 0, start) + 1
+        line_end = data.find(b"\n", start)
+        if line_end == -1:
+            line_end = len(data)
+        line = data[line_start:line_end].decode(errors="replace")
+        matches.append(_format_match(rel, line_no, line))
+        # Report each line once: resume at the start of the next line
+        pos = counted = line_end + 1
+        line_no += 1
+    return matches
+
+
+def _search_with_python(
+    root: Path,
+    query: str,
+    file_pattern: str,
+    max_results: int,
+) -> list[str]:
+    """Case-insensitive literal search of *root*, used when ripgrep is absent.
+
+    Candidate files are read and scanned on a thread pool (file reads
+    release the GIL) in bounded batches, so no further files are read
+    once *max_results* matches are found; results are still collected
+    in walk order.  A single batch is scanned serially.
+    """
+    limit = max(1, max_results)
+    candidates: list[Path] = []
+    name_re = _compile_file_pattern(file_pattern)
+    match_path = "/" in file_pattern
+    for rel in _repo_listing(root).files():
+        if not name_re.match(rel if match_path else rel.rpartition("/")[2]):
+            continue
+        file_path = root / rel
+        try:
+            st = file_path.stat()
+        except OSError:
+            continue
+        if st.st_size > _SEARCH_MAX_FILE_BYTES:
+            continue
+        candidates.append(file_path)
+
+    def _scan(file_path: Path) -> list[str]:
+        return _scan_file(file_path, root, query, limit)
+
+    matches: list[str] = []
+    if len(candidates) <= _SEARCH_BATCH:
+        for file_path in candidates:
+            matches.extend(_scan(file_path))
+            if len(matches) >= limit:
+                break
+        return matches[:limit]
+
+    with ThreadPoolExecutor(max_workers=_SEARCH_WORKERS) as pool:
+        for start in range(0, len(candidates), _SEARCH_BATCH):
+            for found in pool.map(_scan, candidates[start:start + _SEARCH_BATCH]):
+                matches.extend(found)
+            if len(matches) >= limit:
+                break
+
+    return matches[:limit]
+
+
+# ── Git result cache ─────────────────────────────────────────────────
+
+# Seconds between ``git rev-parse HEAD`` checks of the git result cache
+_HEAD_CHECK_INTERVAL = 5.0
+
+# Columns of a GitOps commit dict used by search_git_history, in output order
+_COMMIT_FIELDS = itemgetter("short_hash", "date", "author", "message")
+
+
+class _GitResultCache:
+    """Memoizes read-only ``GitOps`` queries for as long as HEAD is unchanged.
+
+    Results are keyed by ``(head_sha, method, *args)``.  HEAD is re-read at
+    most once every ``_HEAD_CHECK_INTERVAL`` seconds, so a new commit is
+    picked up shortly after it lands without shelling out on every call.
+    Cached results are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, git_ops: Any, maxsize: int = 256) -> None:
+        self._git_ops = git_ops
+        self._head: str | None = None
+        self._checked_at = float("-inf")
+        self._call = functools.lru_cache(maxsize=maxsize)(self._uncached)
+
+    def _uncached(self, head: str | None, method: str, *args: Any) -> Any:
+        return getattr(self._git_ops, method)(*args)
+
+    def _current_head(self) -> str | None:
+        now = time.monotonic()
+        if now - self._checked_at >= _HEAD_CHECK_INTERVAL:
+            self._head = self._git_ops.head_sha()
+            self._checked_at = now
+        return self._head
+
+    def call(self, method: str, *args: Any) -> Any:
+        """Return ``git_ops.<method>(*args)``, reusing results for this HEAD."""
+        return self._call(self._current_head(), method, *args)
+
+
+# ── Related-doc helpers ──────────────────────────────────────────────
+
+
+def _dir_docs(directory: Path) -> list[Path]:
+    """``*.md`` then ``*.rst`` entries of *directory*, from a single scan."""
+    md: list[Path] = []
+    rst: list[Path] = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.endswith(".md"):
+                    md.append(directory / entry.name)
+                elif entry.name.endswith(".rst"):
+                    rst.append(directory / entry.name)
+    except OSError:
+        return []
+    return md + rst
+
+
+# docs/ directory → (mtime_ns of every directory walked, markdown files)
+_DOCS_LISTINGS: dict[Path, tuple[list[tuple[str, int]], list[Path]]] = {}
+
+
+def _docs_tree_markdown(docs_dir: Path) -> list[Path]:
+    """Every ``*.md`` file under *docs_dir*, in ``rglob`` order.
+
+    The listing is cached and only re-walked when one of the walked
+    directories changed (adding or removing an entry bumps its mtime),
+    so repeated lookups cost one ``stat`` per directory.  The returned
+    list is shared and must not be mutated.
+    """
+    cached = _DOCS_LISTINGS.get(docs_dir)
+    if cached is not None:
+        try:
+            if all(os.stat(d).st_mtime_ns == mtime for d, mtime in cached[0]):
+                return cached[1]
+        except OSError:
+            pass
+
+    dirs: list[tuple[str, int]] = []
+    found: list[Path] = []
+
+    def _visit(directory: str) -> None:
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            return
+        dirs.append((directory, mtime))
+        found.extend(Path(e.path) for e in entries if e.name.endswith(".md"))
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                _visit(entry.path)
+
+    _visit(str(docs_dir))
+    _DOCS_LISTINGS[docs_dir] = (dirs, found)
+    return found
+
+
+# ── PR search cache ──────────────────────────────────────────────────
+
+# Seconds a fetched PR list is reused by get_pr_details keyword searches
+_PR_LIST_TTL = 60.0
+
+
+class _PRSearchIndex:
+    """Recently listed PRs together with their casefolded title and body.
+
+    Keyword searches reuse the listing for ``_PR_LIST_TTL`` seconds, so
+    consecutive searches cost neither an API round trip nor re-folding
+    the text of every PR.
+    """
+
+    def __init__(self, github_client: Any) -> None:
+        self._github_client = github_client
+        self._fetched_at = float("-inf")
+        self._entries: list[tuple[dict[str, Any], str, str]] = []
+
+    async def search(self, query: str, limit: int) -> list[dict[str, Any]]:
+        """Return up to *limit* PRs whose title or body contains *query*."""
+        if time.monotonic() - self._fetched_at >= _PR_LIST_TTL:
+            prs = await self._github_client.list_prs(state="all")
+            self._entries = [
+                (p, (p.get("title") or "").casefold(), (p.get("body") or "").casefold())
+                for p in prs
+            ]
+            self._fetched_at = time.monotonic()
+        needle = query.casefold()
+        return list(islice(
+            (p for p, title, body in self._entries if needle in title or needle in body),
+            max(0, limit),
+        ))
+
+
+# ── Stale-doc helpers ────────────────────────────────────────────────
+
+# Backtick-quoted file paths in docs, e.g. `src/app.py`
+_BACKTICK_REF_RE = re.compile(r"`([a-zA-Z0-9_/\-\.]+\.[a-zA-Z]+)`")
+
+# detect_stale_docs stats referenced paths one by one until this many have
+# been checked, then switches to a set of every file in the repository
+_STALE_REF_STAT_LIMIT = 32
+
+
 # ── Tool factory ─────────────────────────────────────────────────────
 
 
@@ -110,6 +591,8 @@ def build_tools(
 
     tools = []
     repo_root = repo_path.resolve()
+    git_cache = _GitResultCache(git_ops) if git_ops is not None else None
+    pr_index = _PRSearchIndex(github_client) if github_client is not None else None
 
     def _safe_repo_path(user_path: str) -> tuple[Path | None, str | None]:
         raw = (user_path or "").strip()
@@ -134,19 +617,16 @@ def build_tools(
         if git_ops is None:
             return "Git operations not available (not a git repository)"
         try:
-            commits = git_ops.search_log(
-                query=params.query,
-                path=params.path or None,
-                max_count=params.max_results,
+            assert git_cache is not None
+            commits = git_cache.call(
+                "search_log", params.query, params.path or None, params.max_results
             )
             if not commits:
                 return f"No commits found matching '{params.query}'"
-            lines = []
-            for c in commits:
-                lines.append(
-                    f"- `{c['short_hash']}` ({c['date']}) by {c['author']}: {c['message']}"
-                )
-            return "\n".join(lines)
+            return "\n".join([
+                f"- `{short_hash}` ({date}) by {author}: {message}"
+                for short_hash, date, author, message in map(_COMMIT_FIELDS, commits)
+            ])
         except Exception as exc:
             return f"Error searching git history: {exc}"
 
@@ -159,7 +639,8 @@ def build_tools(
         if git_ops is None:
             return "Git operations not available (not a git repository)"
         try:
-            files = git_ops.commit_files(params.commit_hash)
+            assert git_cache is not None
+            files = git_cache.call("commit_files", params.commit_hash)
             if not files:
                 return f"No files found for commit `{params.commit_hash}`"
             lines = [f"Files changed in commit `{params.commit_hash}`:"]
@@ -178,7 +659,8 @@ def build_tools(
         if git_ops is None:
             return "Git operations not available"
         try:
-            contributors = git_ops.file_contributors(params.file_path)
+            assert git_cache is not None
+            contributors = git_cache.call("file_contributors", params.file_path)
             if not contributors:
                 return f"No contributors found for '{params.file_path}'"
             lines = [f"Contributors to `{params.file_path}`:"]
@@ -192,8 +674,7 @@ def build_tools(
 
     # ── read_source_file ─────────────────────────────────────────────
 
-    @define_tool(description="Read the contents of a source file from the repository. Can read the entire file or a specific line range.")
-    async def read_source_file(params: ReadFileParams) -> str:
+    def _read_source_file(params: ReadFileParams) -> str:
         try:
             full_path, path_err = _safe_repo_path(params.file_path)
             if path_err:
@@ -205,26 +686,49 @@ def build_tools(
             if not full_path.is_file():
                 return f"Not a file: {params.file_path}"
 
-            content = full_path.read_text(errors="replace")
-            lines = content.splitlines()
-
             if params.start_line > 0 or params.end_line > 0:
                 start = max(0, params.start_line - 1)
-                end = params.end_line if params.end_line > 0 else len(lines)
-                selected = lines[start:end]
-                header = f"File: {params.file_path} (lines {start + 1}-{min(end, len(lines))})"
+                stop = params.end_line if params.end_line > 0 else None
+                selected: list[str] = []
+                # Stream up to the last requested line; the tail is never read
+                shown = 0
+                with full_path.open(errors="replace") as f:
+                    for shown, line in enumerate(islice(_iter_lines(f), stop), 1):
+                        if shown > start:
+                            selected.append(line)
+                header = f"File: {params.file_path} (lines {start + 1}-{shown})"
                 return f"{header}\n\n```\n" + "\n".join(selected) + "\n```"
 
+            content: str | None = None
+            head: str | None
+            if full_path.stat().st_size <= _READ_WHOLE_MAX_BYTES:
+                content = full_path.read_text(errors="replace")
+                head, total = _head_and_count(content, _READ_MAX_LINES)
+            else:
+                # Keep only the head of a large file in memory; count the rest
+                with full_path.open(errors="replace") as f:
+                    rest = _iter_lines(f)
+                    head_lines = list(islice(rest, _READ_MAX_LINES))
+                    total = len(head_lines) + sum(1 for _ in rest)
+                head = "\n".join(head_lines)
+
             # Truncate very large files
-            if len(lines) > 300:
-                truncated = lines[:300]
-                header = f"File: {params.file_path} (first 300 of {len(lines)} lines)"
-                return f"{header}\n\n```\n" + "\n".join(truncated) + "\n```\n\n... (truncated)"
+            if total > _READ_MAX_LINES:
+                header = f"File: {params.file_path} (first {_READ_MAX_LINES} of {total} lines)"
+                return f"{header}\n\n```\n{head}\n```\n\n... (truncated)"
 
-            return f"File: {params.file_path} ({len(lines)} lines)\n\n```\n{content}\n```"
+            if content is None:
+                content = full_path.read_text(errors="replace")
+            return f"File: {params.file_path} ({total} lines)\n\n```\n{content}\n```"
         except Exception as exc:
             return f"Error reading file: {exc}"
 
+    @define_tool(description="Read the contents of a source file from the repository. Can read the entire file or a specific line range.")
+    async def read_source_file(params: ReadFileParams) -> str:
+        # Blocking file I/O runs on a worker thread so that concurrent tool
+        # calls are not stalled behind it
+        return await asyncio.to_thread(_read_source_file, params)
+
     tools.append(read_source_file)
 
     # ── search_code ──────────────────────────────────────────────────
@@ -232,34 +736,16 @@ def build_tools(
     @define_tool(description="Search for text patterns across source files in the repository. Returns matching file paths and line numbers with context.")
     async def search_code(params: SearchCodeParams) -> str:
         try:
-            import re
-
-            pattern = re.compile(re.escape(params.query), re.IGNORECASE)
-            matches: list[str] = []
-            skip_dirs = {".git", "__pycache__", "node_modules", ".venv", "venv", "dist", "build"}
-
-            for file_path in repo_path.rglob(params.file_pattern):
-                if any(part in skip_dirs for part in file_path.parts):
-                    continue
-                if not file_path.is_file():
-                    continue
-                if file_path.stat().st_size > 512 * 1024:
-                    continue
-
-                try:
-                    content = file_path.read_text(errors="replace")
-                except OSError:
-                    continue
-
-                for i, line in enumerate(content.splitlines(), 1):
-                    if pattern.search(line):
-                        rel = file_path.relative_to(repo_path).as_posix()
-                        matches.append(f"- `{rel}:{i}`: {line.strip()[:120]}")
-                        if len(matches) >= params.max_results:
-                            break
-
-                if len(matches) >= params.max_results:
-                    break
+            rg = _rg_executable()
+            if rg is not None:
+                matches = await _search_with_rg(
+                    rg, repo_path, params.query, params.file_pattern, params.max_results
+                )
+            else:
+                matches = await asyncio.to_thread(
+                    _search_with_python,
+                    repo_root, params.query, params.file_pattern, params.max_results,
+                )
 
             if not matches:
                 return f"No matches found for '{params.query}'"
@@ -274,7 +760,6 @@ def build_tools(
     @define_tool(description="Get a high-level architecture summary of the repository including directory structure, detected languages, and frameworks.")
     async def get_architecture_summary(params: GetArchitectureSummaryParams) -> str:
         try:
-            from codecompass.indexer.scanner import RepoScanner
             scanner = RepoScanner(repo_path, tree_depth=params.depth)
             summary = scanner.scan()
             return summary.to_text()
@@ -305,17 +790,14 @@ def build_tools(
                     d.resolve().relative_to(repo_root)
                 except ValueError:
                     continue
-                for md in d.glob("*.md"):
-                    rel = md.relative_to(repo_path).as_posix()
-                    docs.append(f"- `{rel}`")
-                for rst in d.glob("*.rst"):
-                    rel = rst.relative_to(repo_path).as_posix()
+                for doc in _dir_docs(d):
+                    rel = doc.relative_to(repo_path).as_posix()
                     docs.append(f"- `{rel}`")
 
             # Check for a docs/ directory at repo root
             docs_dir = repo_path / "docs"
             if docs_dir.is_dir():
-                for md in docs_dir.rglob("*.md"):
+                for md in _docs_tree_markdown(docs_dir):
                     rel = md.relative_to(repo_path).as_posix()
                     docs.append(f"- `{rel}`")
 
@@ -331,8 +813,7 @@ def build_tools(
 
     # ── detect_stale_docs ────────────────────────────────────────────
 
-    @define_tool(description="Detect potentially stale or outdated documentation by comparing doc content against actual code. Checks for mismatched commands, renamed files, and outdated references.")
-    async def detect_stale_docs(params: DetectStaleDocsParams) -> str:
+    def _detect_stale_docs(params: DetectStaleDocsParams) -> str:
         try:
             findings: list[str] = []
             doc_files: list[Path] = []
@@ -350,6 +831,23 @@ def build_tools(
                 for pattern in ["*.md", "*.rst", "docs/**/*.md", "docs/**/*.rst"]:
                     doc_files.extend(repo_path.glob(pattern))
 
+            # Existence checks are shared by every doc: check each path once
+            exists_cache: dict[str, bool] = {}
+            repo_files: set[str] | None = None
+
+            def _exists(rel_path: str) -> bool:
+                nonlocal repo_files
+                found = exists_cache.get(rel_path)
+                if found is None:
+                    if repo_files is None and len(exists_cache) >= _STALE_REF_STAT_LIMIT:
+                        repo_files = _repo_listing(repo_root).file_set()
+                    # A set miss may still be a directory or a skipped path
+                    found = (repo_files is not None and rel_path in repo_files) or (
+                        repo_path / rel_path
+                    ).exists()
+                    exists_cache[rel_path] = found
+                return found
+
             for doc in doc_files:
                 if not doc.is_file():
                     continue
@@ -359,24 +857,22 @@ def build_tools(
                 except OSError:
                     continue
 
-                # Check for references to files that don't exist
-                import re
-                # Match backtick-quoted file paths
-                refs = re.findall(r'`([a-zA-Z0-9_/\-\.]+\.[a-zA-Z]+)`', content)
-                for ref in refs:
-                    ref_path = repo_path / ref
-                    if ref.startswith(("http", "ftp", "#")):
-                        continue
-                    if not ref_path.exists() and "/" in ref:
-                        findings.append(
-                            f"- **{rel}**: References `{ref}` which does not exist"
-                        )
+                # Check for references to files that don't exist (most docs
+                # have no backticks at all, so skip the regex for those)
+                if "`" in content:
+                    for ref in dict.fromkeys(_BACKTICK_REF_RE.findall(content)):
+                        if "/" not in ref or ref.startswith(("http", "ftp", "#")):
+                            continue
+                        if not _exists(ref):
+                            findings.append(
+                                f"- **{rel}**: References `{ref}` which does not exist"
+                            )
 
                 # Check for common stale patterns
-                if "npm start" in content and not (repo_path / "package.json").exists():
+                if "npm start" in content and not _exists("package.json"):
                     findings.append(f"- **{rel}**: Mentions `npm start` but no package.json found")
-                if "pip install" in content and not (repo_path / "pyproject.toml").exists():
-                    if not (repo_path / "setup.py").exists() and not (repo_path / "requirements.txt").exists():
+                if "pip install" in content and not _exists("pyproject.toml"):
+                    if not _exists("setup.py") and not _exists("requirements.txt"):
                         findings.append(f"- **{rel}**: Mentions `pip install` but no Python packaging found")
 
             if not findings:
@@ -385,6 +881,10 @@ def build_tools(
         except Exception as exc:
             return f"Error detecting stale docs: {exc}"
 
+    @define_tool(description="Detect potentially stale or outdated documentation by comparing doc content against actual code. Checks for mismatched commands, renamed files, and outdated references.")
+    async def detect_stale_docs(params: DetectStaleDocsParams) -> str:
+        return await asyncio.to_thread(_detect_stale_docs, params)
+
     tools.append(detect_stale_docs)
 
     # ── get_symbol_info ──────────────────────────────────────────────
@@ -394,14 +894,14 @@ def build_tools(
         if knowledge_graph is None:
             return "Knowledge graph not available"
         try:
-            results = knowledge_graph.query(params.symbol_name)
-            if not results:
+            total = len(knowledge_graph.query(params.symbol_name))
+            if not total:
                 return f"No symbols found matching '{params.symbol_name}'"
-            lines = [f"Found {len(results)} symbol(s) matching '{params.symbol_name}':"]
-            for sym in results[:15]:
-                loc = f"`{sym.file}:{sym.line}`" if sym.line else f"`{sym.file}`"
-                doc = f" — {sym.docstring[:100]}..." if sym.docstring else ""
-                lines.append(f"- **{sym.kind}** `{sym.name}` at {loc}{doc}")
+            lines = [f"Found {total} symbol(s) matching '{params.symbol_name}':"]
+            for kind, name, line, file, doc in knowledge_graph.query_summary(params.symbol_name, 15):
+                loc = f"`{file}:{line}`" if line else f"`{file}`"
+                snippet = f" — {doc}..." if doc else ""
+                lines.append(f"- **{kind}** `{name}` at {loc}{snippet}")
             return "\n".join(lines)
         except Exception as exc:
             return f"Error looking up symbol: {exc}"
@@ -448,10 +948,19 @@ def build_tools(
             # Try to interpret query as a PR number
             try:
                 pr_num = int(params.query)
-                pr = await github_client.get_pr(pr_num)
+                # Independent requests: fetch them concurrently, but wait for
+                # all of them before surfacing the first failure
+                results = await asyncio.gather(
+                    github_client.get_pr(pr_num),
+                    github_client.get_pr_comments(pr_num),
+                    github_client.get_pr_reviews(pr_num),
+                    return_exceptions=True,
+                )
+                for result in results:
+                    if isinstance(result, BaseException):
+                        raise result
+                pr, comments, reviews = results
                 if pr:
-                    comments = await github_client.get_pr_comments(pr_num)
-                    reviews = await github_client.get_pr_reviews(pr_num)
                     lines = [
                         f"## PR #{pr['number']}: {pr['title']}",
                         f"- **State:** {pr['state']}",
@@ -481,11 +990,8 @@ def build_tools(
                 pass  # Not a number, search instead
 
             # Search PRs by query
-            prs = await github_client.list_prs(state="all")
-            matching = [
-                p for p in prs
-                if params.query.lower() in ((p.get("title") or "") + (p.get("body") or "")).lower()
-            ][:params.max_results]
+            assert pr_index is not None
+            matching = await pr_index.search(params.query, params.max_results)
 
             if not matching:
                 return f"No pull requests found matching '{params.query}'"
@@ -9,24 +9,57 @@ Commands:
     audit         Audit documentation freshness
     chat          Interactive multi-turn chat
     tui           Launch the interactive terminal UI
+    cache         Manage the on-disk analysis cache
     config        Manage CodeCompass configuration (incl. set-model)
 """
 
 from __future__ import annotations
 
-import asyncio
+import contextlib
+import functools
+import heapq
+import io
 import logging
 import sys
+import time
+from collections import Counter
+from operator import itemgetter
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import click
-from rich.console import Console
-from rich.table import Table
 
 from codecompass import __version__
-from codecompass.utils.config import Settings
 
-console = Console()
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from codecompass.indexer.knowledge_graph import KnowledgeGraph
+    from codecompass.utils.config import Settings
+
+
+# rich, asyncio and the settings model (which pulls in pydantic and the
+# formatting helpers) are imported on first use so ``--help`` and
+# ``--version`` stay fast.
+
+
+@functools.cache
+def _console() -> Console:
+    """Return the shared Rich console, creating it on first use."""
+    from rich.console import Console
+
+    return Console()
+
+
+def __getattr__(name: str) -> Any:
+    # PEP 562: keep ``cli.console`` and ``cli.Settings`` importable.
+    if name == "console":
+        return _console()
+    if name == "Settings":
+        from codecompass.utils.config import Settings
+
+        return Settings
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 _FALLBACK_MODELS: list[tuple[str, str]] = [
@@ -41,6 +74,29 @@ _FALLBACK_MODELS: list[tuple[str, str]] = [
 ]
 
 
+# Module prefixes that are never part of the project itself (test suites)
+_NON_PROJECT_PREFIXES = ("tests.", "e2e_")
+
+# Top-level stdlib package names, left out of the exported dependency list
+_STDLIB_MODULES: frozenset[str] = sys.stdlib_module_names
+
+# One commit's section of the diff-explain prompt; *body* holds its diff
+_COMMIT_CONTEXT = (
+    "### Commit `{short_hash}` — {message}\n"
+    "- **Author:** {author}\n"
+    "- **Date:** {date}\n"
+    "{body}"
+)
+
+# One contributor entry in the yaml and csv exports
+_CONTRIBUTOR_YAML = '- name: {name}\n  commits: {commits}\n  email: "{email}"'
+_CONTRIBUTOR_CSV = '"{name}",{commits},"{email}"'
+
+
+# Inputs that end an interactive chat session
+_EXIT_COMMANDS = frozenset({"exit", "quit", "q"})
+
+
 _PREMIUM_USAGE: dict[str, tuple[str, str]] = {
     "ask": ("yes", "Sends prompt to Copilot model via SDK session"),
     "why": ("yes", "Sends prompt to Copilot model via SDK session"),
@@ -65,12 +121,12 @@ def _confirm_ai_action(settings: Settings, command_name: str, *, skip_confirm: b
     detail = entry[1] if entry else ""
 
     if rate == "0x":
-        console.print(
+        _console().print(
             f"[dim]Model:[/] [cyan]{settings.model}[/] (free) — {detail}"
         )
         return True
 
-    console.print(
+    _console().print(
         f"[yellow]💎 Premium request:[/] [cyan]{settings.model}[/] "
         f"({rate} per request) — {detail}"
     )
@@ -96,6 +152,24 @@ def _get_model_rate(model: str) -> str:
     return "unknown"
 
 
+def _run_async(coro):
+    """Run *coro* to completion on a fresh event loop.
+
+    Uses uvloop when it is installed (``pip install codecompass[speedups]``)
+    and falls back to the stdlib loop otherwise, including on Windows.
+    """
+    import asyncio
+
+    if sys.platform != "win32":
+        try:
+            import uvloop  # type: ignore[import-not-found]
+        except ModuleNotFoundError:
+            pass
+        else:
+            return uvloop.run(coro)
+    return asyncio.run(coro)
+
+
 def _configure_logging(level: str) -> None:
     logging.basicConfig(
         level=getattr(logging, level.upper(), logging.WARNING),
@@ -232,8 +306,19 @@ def _available_models_with_premium() -> list[tuple[str, str]]:
 
         return parsed or _FALLBACK_MODELS
 
+    import asyncio
+
     try:
-        return asyncio.run(_fetch())
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return _run_async(_fetch())
+        # Called from a command's event loop (e.g. ``/models`` in chat):
+        # a loop cannot be nested, so fetch on a fresh one in a worker.
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(_run_async, _fetch()).result()
     except Exception:
         return _FALLBACK_MODELS
 
@@ -251,8 +336,12 @@ def _github_token_status(settings: Settings) -> tuple[bool, str]:
     return False, "not set"
 
 
+@functools.lru_cache(maxsize=4)
 def _init_git(repo_path: Path):
-    """Create a GitOps instance (returns None if not a git repo)."""
+    """Create a GitOps instance (returns None if not a git repo).
+
+    Memoized so chained commands (e.g. ``onboard -i``) share one instance.
+    """
     from codecompass.github.git import GitOps, GitOpsError
 
     try:
@@ -261,6 +350,32 @@ def _init_git(repo_path: Path):
         return None
 
 
+def _build_graph(repo_path: Path, settings: Settings):
+    """Load or build the KnowledgeGraph for *repo_path* (None on failure).
+
+    Goes through the agent so clean checkouts reuse the on-disk graph
+    cached for their ``HEAD``.
+    """
+    from codecompass.agent.agent import CodeCompassAgent
+
+    try:
+        return CodeCompassAgent(repo_path, settings=settings).graph
+    except Exception:
+        return None
+
+
+def _system_message(agent, mode) -> dict[str, str] | None:
+    """Build *agent*'s system message for *mode* (None if it is too large)."""
+    try:
+        return agent.system_message(mode)
+    except ValueError as exc:
+        _console().print(
+            f"[red]Error:[/] {exc}\n"
+            "[dim]Raise CODECOMPASS_MAX_PROMPT_CHARS to allow a larger prompt.[/]"
+        )
+        return None
+
+
 def _init_github_client(git_ops, settings: Settings):
     """Create a GitHubClient from the repo remote URL, if possible."""
     if git_ops is None:
@@ -280,6 +395,133 @@ def _init_github_client(git_ops, settings: Settings):
         return None
 
 
+class _DeltaWriter:
+    """Coalesce streamed response deltas into fewer stdout writes.
+
+    Deltas are a few bytes each, so writing and flushing every one costs
+    a syscall per token.  Pending text is flushed on a newline, once
+    ``_FLUSH_CHARS`` are buffered, or when ``_FLUSH_INTERVAL`` seconds
+    have passed since the last flush.  Given the *loop* the deltas arrive
+    on, a timer also flushes text left pending when the stream stalls.
+    Call :meth:`flush` when done.
+    """
+
+    _FLUSH_CHARS = 256
+    _FLUSH_INTERVAL = 0.016
+
+    def __init__(self, loop: Any = None) -> None:
+        self._stream = sys.stdout
+        self._loop = loop
+        self._timer: Any = None
+        self._pending: list[str] = []
+        self._size = 0
+        self._last_flush = time.monotonic()
+
+    def write(self, delta: str) -> None:
+        self._pending.append(delta)
+        self._size += len(delta)
+        if (
+            "\n" in delta
+            or self._size >= self._FLUSH_CHARS
+            or time.monotonic() - self._last_flush >= self._FLUSH_INTERVAL
+        ):
+            self.flush()
+        elif self._timer is None and self._loop is not None:
+            self._timer = self._loop.call_later(self._FLUSH_INTERVAL, self.flush)
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._pending:
+            self._stream.write("".join(self._pending))
+            self._pending.clear()
+            self._size = 0
+        self._stream.flush()
+        self._last_flush = time.monotonic()
+
+
+async def _read_line(prompt: str) -> str:
+    """Read a line of console input without blocking the event loop.
+
+    The blocking read runs on a daemon thread, so a read abandoned by
+    Ctrl+C never holds up interpreter exit.
+    """
+    import asyncio
+    import threading
+
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future[str] = loop.create_future()
+
+    def _settle(line: str | None, exc: Exception | None) -> None:
+        if future.done():
+            return
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(line)
+
+    def _reader() -> None:
+        try:
+            line, exc = _console().input(prompt), None
+        except Exception as err:
+            line, exc = None, err
+        try:
+            loop.call_soon_threadsafe(_settle, line, exc)
+        except RuntimeError:
+            pass  # the loop already closed
+
+    threading.Thread(target=_reader, name="codecompass-input", daemon=True).start()
+    return await future
+
+
+@contextlib.asynccontextmanager
+async def _compass_session(
+    repo_path: Path,
+    settings: Settings,
+    system_message: dict[str, str],
+    *,
+    kg: KnowledgeGraph | None = None,
+):
+    """Start a ``CompassClient`` with a streaming session open on it.
+
+    When *kg* is None the repo is indexed in a worker thread while the
+    SDK client starts up; that build is cancelled if startup fails.
+    """
+    import asyncio
+
+    from codecompass.agent.client import CompassClient
+
+    git_ops = _init_git(repo_path)
+
+    kg_task = None
+    if kg is None:
+        kg_task = asyncio.ensure_future(asyncio.to_thread(_build_graph, repo_path, settings))
+
+    try:
+        gh_client = _init_github_client(git_ops, settings)
+
+        async with CompassClient(
+            repo_path,
+            model=settings.model,
+            git_ops=git_ops,
+            knowledge_graph=kg,
+            github_client=gh_client,
+        ) as client:
+            if kg_task is not None:
+                client.attach_knowledge_graph(await kg_task)
+            await client.create_session(
+                system_message=system_message,
+                streaming=True,
+            )
+            yield client
+    finally:
+        if kg_task is not None and not kg_task.done():
+            kg_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await kg_task
+
+
 async def _run_with_sdk(
     repo_path: Path,
     settings: Settings,
@@ -287,100 +529,65 @@ async def _run_with_sdk(
     prompt: str,
     *,
     status_msg: str = "Thinking…",
+    kg: KnowledgeGraph | None = None,
 ) -> None:
     """Send a prompt to the Copilot SDK and stream the response.
 
     Shows a Rich spinner while waiting for the first token, then
-    streams output to stdout.  Catches timeouts gracefully.
+    streams output to stdout.  Catches timeouts gracefully.  Pass an
+    already-built *kg* to skip re-indexing the repository.
     """
-    from codecompass.agent.client import CompassClient
-    from codecompass.indexer.knowledge_graph import KnowledgeGraph
-
-    git_ops = _init_git(repo_path)
-
-    kg = KnowledgeGraph()
-    try:
-        kg.build(repo_path)
-    except Exception:
-        kg = None
-
-    gh_client = _init_github_client(git_ops, settings)
-
-    async with CompassClient(
-        repo_path,
-        model=settings.model,
-        git_ops=git_ops,
-        knowledge_graph=kg,
-        github_client=gh_client,
-    ) as client:
-        await client.create_session(
-            system_message=system_message,
-            streaming=True,
-        )
+    import asyncio
 
+    async with _compass_session(repo_path, settings, system_message, kg=kg) as client:
         first_token = True
-        status = console.status(f"[bold cyan]{status_msg}[/]")
+        status = _console().status(f"[bold cyan]{status_msg}[/]")
         status.start()
+        writer = _DeltaWriter(asyncio.get_running_loop())
 
         def on_delta(delta: str) -> None:
             nonlocal first_token
             if first_token:
                 status.stop()
-                console.print()
+                _console().print()
                 first_token = False
-            sys.stdout.write(delta)
-            sys.stdout.flush()
+            writer.write(delta)
 
         try:
             await client.send_and_collect(prompt, on_delta=on_delta)
         except RuntimeError as exc:
+            writer.flush()
             status.stop()
             if "timed out" in str(exc).lower() or "timeout" in str(exc).lower():
-                console.print(
+                _console().print(
                     "\n[yellow]⚠ The Copilot model timed out.[/] "
                     "Try again or use a different model."
                 )
                 return
             raise
         finally:
+            writer.flush()
             if first_token:
                 status.stop()
 
-        console.print("\n")
+        _console().print("\n")
 
 
 async def _interactive_session(
     repo_path: Path,
     settings: Settings,
     system_message: dict[str, str],
+    *,
+    kg: KnowledgeGraph | None = None,
 ) -> None:
-    """Run an interactive multi-turn chat session with the Copilot SDK."""
-    from codecompass.agent.client import CompassClient
-    from codecompass.indexer.knowledge_graph import KnowledgeGraph
-
-    git_ops = _init_git(repo_path)
+    """Run an interactive multi-turn chat session with the Copilot SDK.
 
-    kg = KnowledgeGraph()
-    try:
-        kg.build(repo_path)
-    except Exception:
-        kg = None
-
-    gh_client = _init_github_client(git_ops, settings)
-
-    async with CompassClient(
-        repo_path,
-        model=settings.model,
-        git_ops=git_ops,
-        knowledge_graph=kg,
-        github_client=gh_client,
-    ) as client:
-        await client.create_session(
-            system_message=system_message,
-            streaming=True,
-        )
+    Pass an already-built *kg* to skip re-indexing the repository.
+    """
+    import asyncio
 
-        console.print(
+    async with _compass_session(repo_path, settings, system_message, kg=kg) as client:
+        _console().print(
             "\n[bold cyan]🧭 CodeCompass[/] — Interactive mode "
             f"[dim](model: {settings.model})[/]\n"
             "[dim]Commands: /model <name> to switch model, "
@@ -391,7 +598,7 @@ async def _interactive_session(
         token_ok, token_desc = _github_token_status(settings)
         token_style = "green" if token_ok else "red"
         token_icon = "✓" if token_ok else "✗"
-        console.print(
+        _console().print(
             f"  GitHub token: [{token_style}]{token_icon} {token_desc}[/]\n"
         )
 
@@ -399,55 +606,55 @@ async def _interactive_session(
 
         while True:
             try:
-                question = console.input("[bold green]You:[/] ")
+                question = await _read_line("[bold green]You:[/] ")
             except (EOFError, KeyboardInterrupt):
                 break
 
             stripped = question.strip()
-            if stripped.lower() in ("exit", "quit", "q"):
-                break
             if not stripped:
                 continue
+            # Slash commands are matched on their first word only
+            command, _, argument = stripped.partition(" ")
+            command = command.lower()
+            if command in _EXIT_COMMANDS and not argument:
+                break
 
-            # Slash commands
-            if stripped.lower() == "/models":
+            if command == "/models":
                 models = _available_models_with_premium()
                 model_text = ", ".join(
                     f"{name} ({rate})" if rate != "0x" else f"{name} (free)"
                     for name, rate in models
                 )
-                console.print(f"\n[bold]Available models:[/] {model_text}")
-                console.print(f"[dim]Current: {current_model}[/]\n")
+                _console().print(f"\n[bold]Available models:[/] {model_text}")
+                _console().print(f"[dim]Current: {current_model}[/]\n")
                 continue
 
-            if stripped.lower().startswith("/model "):
-                new_model = stripped[7:].strip()
+            if command == "/model":
+                new_model = argument.strip()
                 if not new_model:
-                    console.print(f"[dim]Current model: {current_model}[/]")
+                    _console().print(f"[dim]Current model: {current_model}[/]")
                     continue
-                # Recreate the client with the new model
-                console.print(f"[dim]Switching to {new_model}…[/]")
-                await client.stop()
-                client._model = new_model
-                current_model = new_model
-                await client.start()
-                await client.create_session(
+                # Open a new session on the running client with the new model
+                _console().print(f"[dim]Switching to {new_model}…[/]")
+                await client.switch_model(
+                    new_model,
                     system_message=system_message,
                     streaming=True,
                 )
-                console.print(f"[green]✓ Now using {new_model}[/]\n")
+                current_model = new_model
+                _console().print(f"[green]✓ Now using {new_model}[/]\n")
                 continue
 
-            console.print("[bold blue]CodeCompass:[/] ", end="")
-
-            def on_delta(delta: str) -> None:
-                sys.stdout.write(delta)
-                sys.stdout.flush()
+            _console().print("[bold blue]CodeCompass:[/] ", end="")
 
-            await client.send_and_collect(question, on_delta=on_delta)
-            console.print("\n")
+            writer = _DeltaWriter(asyncio.get_running_loop())
+            try:
+                await client.send_and_collect(question, on_delta=writer.write)
+            finally:
+                writer.flush()
+            _console().print("\n")
 
-        console.print("\n[dim]Goodbye![/]\n")
+        _console().print("\n[dim]Goodbye![/]\n")
 
 
 # ── Main CLI group ───────────────────────────────────────────────────
@@ -468,6 +675,8 @@ def main(ctx: click.Context, repo: str, log_level: str | None, model: str | None
         overrides["model"] = model
     overrides["repo_path"] = repo
 
+    from codecompass.utils.config import Settings
+
     settings = Settings.load(overrides, base_path=repo)
     _configure_logging(settings.log_level)
 
@@ -480,7 +689,7 @@ def main(ctx: click.Context, repo: str, log_level: str | None, model: str | None
         # Show quick status summary
         token_ok, token_desc = _github_token_status(settings)
         token_icon = "✓" if token_ok else "✗"
-        console.print(
+        _console().print(
             f"\n  GitHub token: [{('green' if token_ok else 'red')}]{token_icon} {token_desc}[/]"
             f"  |  Model: [cyan]{settings.model}[/]"
         )
@@ -536,50 +745,66 @@ def onboard(
     settings: Settings = ctx.obj["settings"]
     repo_path: Path = ctx.obj["repo_path"]
 
-    with console.status("[bold cyan]Scanning repository…[/]"):
-        agent = CodeCompassAgent(repo_path, settings=settings)
-        summary = asyncio.run(agent.onboard())
-    print_onboarding_summary(summary)
-
-    # --- AI-generated narrative summary --------------------------------
-    want_ai = run_ai  # True, False, or None (ask)
-    if want_ai is None:
-        want_ai = click.confirm(
-            "\nGenerate an AI-powered onboarding summary?", default=True
-        )
-
-    if want_ai:
-        if not _confirm_ai_action(settings, "onboard (AI summary)", skip_confirm=skip_confirm):
-            console.print("[dim]Skipped.[/]")
-        else:
-            ai_prompt = (
-                "Based on the repository context you have, write a concise "
-                "but insightful onboarding summary for a new developer joining "
-                "this project. Cover: purpose, architecture highlights, key "
-                "entry points, how to get started, and anything surprising or "
-                "noteworthy. Be specific — reference actual file names and modules."
+    # Scan, AI summary and interactive chat share one event loop
+    async def _onboard_flow() -> None:
+        with _console().status("[bold cyan]Scanning repository…[/]"):
+            agent = CodeCompassAgent(repo_path, settings=settings)
+            # Only start the graph build if a step below may use it
+            needs_graph = run_ai is not False or bool(output_path) or interactive
+            summary = await agent.scan() if needs_graph else agent.summary
+        # The graph keeps building in a worker while this renders and the
+        # prompts below wait; onboard() joins it before agent.graph is used
+        print_onboarding_summary(summary)
+
+        # --- AI-generated narrative summary ----------------------------
+        want_ai = run_ai  # True, False, or None (ask)
+        if want_ai is None:
+            want_ai = click.confirm(
+                "\nGenerate an AI-powered onboarding summary?", default=True
             )
-            sys_msg = agent.system_message("onboarding")
-            try:
-                asyncio.run(
-                    _run_with_sdk(
-                        repo_path, settings, sys_msg, ai_prompt,
-                        status_msg="Generating AI summary…",
-                    )
-                )
-            except Exception as exc:
-                console.print(f"[yellow]⚠ AI summary unavailable:[/] {exc}")
-
-    # --- Export --------------------------------------------------------
-    if output_path:
-        _export_onboarding(agent, summary, output_path, fmt)
 
-    # --- Interactive mode ----------------------------------------------
-    if interactive:
-        if not _confirm_ai_action(settings, "onboard --interactive", skip_confirm=skip_confirm):
-            return
-        sys_msg = agent.system_message("onboarding")
-        asyncio.run(_interactive_session(repo_path, settings, sys_msg))
+        if want_ai:
+            if not _confirm_ai_action(settings, "onboard (AI summary)", skip_confirm=skip_confirm):
+                _console().print("[dim]Skipped.[/]")
+            else:
+                ai_prompt = (
+                    "Based on the repository context you have, write a concise "
+                    "but insightful onboarding summary for a new developer joining "
+                    "this project. Cover: purpose, architecture highlights, key "
+                    "entry points, how to get started, and anything surprising or "
+                    "noteworthy. Be specific — reference actual file names and modules."
+                )
+                sys_msg = _system_message(agent, "onboarding")
+                await agent.onboard()
+                if sys_msg is not None:
+                    try:
+                        await _run_with_sdk(
+                            repo_path, settings, sys_msg, ai_prompt,
+                            status_msg="Generating AI summary…",
+                            kg=agent.graph,
+                        )
+                    except Exception as exc:
+                        _console().print(f"[yellow]⚠ AI summary unavailable:[/] {exc}")
+
+        # --- Export ----------------------------------------------------
+        if output_path:
+            await agent.onboard()
+            _export_onboarding(agent, summary, output_path, fmt)
+
+        # --- Interactive mode ------------------------------------------
+        if interactive and _confirm_ai_action(
+            settings, "onboard --interactive", skip_confirm=skip_confirm
+        ):
+            sys_msg = _system_message(agent, "onboarding")
+            await agent.onboard()
+            if sys_msg is not None:
+                await _interactive_session(repo_path, settings, sys_msg, kg=agent.graph)
+
+        # Join a build that no step ended up using, so its errors surface
+        if needs_graph:
+            await agent.onboard()
+
+    _run_async(_onboard_flow())
 
 
 # ── ask ──────────────────────────────────────────────────────────────
@@ -606,20 +831,21 @@ def ask(ctx: click.Context, question: str | None, skip_confirm: bool) -> None:
     if not question:
         question = click.prompt("Your question")
         if not question.strip():
-            console.print("[yellow]No question provided.[/]")
+            _console().print("[yellow]No question provided.[/]")
             return
 
     if not _confirm_ai_action(settings, "ask", skip_confirm=skip_confirm):
         return
 
-    with console.status("[bold cyan]Analyzing codebase…[/]"):
-        agent = CodeCompassAgent(repo_path, settings=settings)
-        payload = asyncio.run(agent.ask(question))
+    async def _ask_flow() -> None:
+        with _console().status("[bold cyan]Analyzing codebase…[/]"):
+            agent = CodeCompassAgent(repo_path, settings=settings)
+            payload = await agent.ask(question)
 
-    asyncio.run(
-        _run_with_sdk(repo_path, settings, payload["system_message"], question,
-                      status_msg="Thinking…")
-    )
+        await _run_with_sdk(repo_path, settings, payload["system_message"], question,
+                            status_msg="Thinking…")
+
+    _run_async(_ask_flow())
 
 
 # ── why ──────────────────────────────────────────────────────────────
@@ -646,18 +872,20 @@ def why(ctx: click.Context, question: str | None, skip_confirm: bool) -> None:
     if not question:
         question = click.prompt("Your question")
         if not question.strip():
-            console.print("[yellow]No question provided.[/]")
+            _console().print("[yellow]No question provided.[/]")
             return
 
     if not _confirm_ai_action(settings, "why", skip_confirm=skip_confirm):
         return
 
-    with console.status("[bold cyan]Analyzing codebase…[/]"):
+    with _console().status("[bold cyan]Analyzing codebase…[/]"):
         agent = CodeCompassAgent(repo_path, settings=settings)
-        sys_msg = agent.system_message(AgentMode.WHY)
+        sys_msg = _system_message(agent, AgentMode.WHY)
+    if sys_msg is None:
+        return
 
-    asyncio.run(_run_with_sdk(repo_path, settings, sys_msg, question,
-                              status_msg="Thinking…"))
+    _run_async(_run_with_sdk(repo_path, settings, sys_msg, question,
+                             status_msg="Thinking…"))
 
 
 # ── architecture ─────────────────────────────────────────────────────
@@ -684,19 +912,21 @@ def architecture(ctx: click.Context, skip_confirm: bool) -> None:
     if not _confirm_ai_action(settings, "architecture", skip_confirm=skip_confirm):
         return
 
-    with console.status("[bold cyan]Scanning repository architecture…[/]"):
-        agent = CodeCompassAgent(repo_path, settings=settings)
-        payload = asyncio.run(agent.explore_architecture())
+    async def _architecture_flow() -> None:
+        with _console().status("[bold cyan]Scanning repository architecture…[/]"):
+            agent = CodeCompassAgent(repo_path, settings=settings)
+            payload = await agent.explore_architecture()
 
-    asyncio.run(
-        _run_with_sdk(
+        await _run_with_sdk(
             repo_path,
             settings,
             payload["system_message"],
             payload["user_message"]["content"],
             status_msg="Analyzing architecture…",
+            kg=agent.graph,
         )
-    )
+
+    _run_async(_architecture_flow())
 
 
 # ── contributors ─────────────────────────────────────────────────────
@@ -724,38 +954,31 @@ def contributors(ctx: click.Context, output_path: str | None, fmt: str) -> None:
     import json as json_mod
 
     from codecompass.github.git import GitOps, GitOpsError
-    from codecompass.utils.formatting import print_markdown
 
     repo_path: Path = ctx.obj["repo_path"]
 
     try:
         git = GitOps(repo_path)
     except GitOpsError as exc:
-        console.print(f"[red]Error:[/] {exc}")
+        _console().print(f"[red]Error:[/] {exc}")
         return
 
     contributor_list = git.contributors()
     if not contributor_list:
-        console.print("[yellow]No contributors found.[/]")
+        _console().print("[yellow]No contributors found.[/]")
         return
 
     # ── serialise ──────────────────────────────────────────────────
     if fmt == "json":
         output = json_mod.dumps(contributor_list, indent=2)
     elif fmt == "yaml":
-        lines_out: list[str] = []
-        for c in contributor_list:
-            lines_out.append(f"- name: {c['name']}")
-            lines_out.append(f"  commits: {c['commits']}")
-            lines_out.append(f"  email: \"{c.get('email', '')}\"")
-        output = "\n".join(lines_out)
+        yaml_entry = _CONTRIBUTOR_YAML.format
+        output = "\n".join(
+            yaml_entry(name=c["name"], commits=c["commits"], email=c.get("email", ""))
+            for c in contributor_list
+        )
     elif fmt == "csv":
-        csv_lines = ["name,commits,email"]
-        for c in contributor_list:
-            name = c["name"].replace('"', '""')
-            email = c.get("email", "").replace('"', '""')
-            csv_lines.append(f'"{name}",{c["commits"]},"{email}"')
-        output = "\n".join(csv_lines)
+        output = _contributors_csv(contributor_list)
     else:
         # Rich table to terminal
         output = None
@@ -763,29 +986,44 @@ def contributors(ctx: click.Context, output_path: str | None, fmt: str) -> None:
     if output_path:
         if output is None:
             # Default to csv when saving to file without explicit format
-            csv_lines = ["name,commits,email"]
-            for c in contributor_list:
-                name = c["name"].replace('"', '""')
-                email = c.get("email", "").replace('"', '""')
-                csv_lines.append(f'"{name}",{c["commits"]},"{email}"')
-            output = "\n".join(csv_lines)
+            output = _contributors_csv(contributor_list)
         Path(output_path).write_text(output, encoding="utf-8")
-        console.print(f"[green]Exported to {output_path}[/]")
+        _console().print(f"[green]Exported to {output_path}[/]")
         return
 
     if output is not None:
         # Non-table format to stdout
-        console.print(output)
+        _console().print(output)
         return
 
-    # Default: Rich table
-    lines = ["# Contributors\n", "| Name | Commits | Email |", "|------|---------|-------|"]
+    # Default: Rich table (built directly; no markdown parsing per row)
+    from rich.markup import escape
+    from rich.table import Table
+
+    table = Table(title="Contributors")
+    table.add_column("Name", style="bold")
+    table.add_column("Commits", justify="right")
+    table.add_column("Email")
     for c in contributor_list:
-        lines.append(f"| {c['name']} | {c['commits']} | {c.get('email', '')} |")
+        table.add_row(escape(c["name"]), str(c["commits"]), escape(c.get("email", "")))
+
+    _console().print()
+    _console().print(table)
+    _console().print()
 
-    console.print()
-    print_markdown("\n".join(lines))
-    console.print()
+
+def _contributors_csv(contributor_list: list[dict[str, Any]]) -> str:
+    """Render *contributor_list* as CSV with quoted name and email columns."""
+    csv_row = _CONTRIBUTOR_CSV.format
+    rows = (
+        csv_row(
+            name=c["name"].replace('"', '""'),
+            commits=c["commits"],
+            email=c.get("email", "").replace('"', '""'),
+        )
+        for c in contributor_list
+    )
+    return "\n".join(["name,commits,email", *rows])
 
 
 # ── audit ────────────────────────────────────────────────────────────
@@ -812,19 +1050,20 @@ def audit(ctx: click.Context, skip_confirm: bool) -> None:
     if not _confirm_ai_action(settings, "audit", skip_confirm=skip_confirm):
         return
 
-    with console.status("[bold cyan]Scanning documentation…[/]"):
-        agent = CodeCompassAgent(repo_path, settings=settings)
-        payload = asyncio.run(agent.audit_docs())
+    async def _audit_flow() -> None:
+        with _console().status("[bold cyan]Scanning documentation…[/]"):
+            agent = CodeCompassAgent(repo_path, settings=settings)
+            payload = await agent.audit_docs()
 
-    asyncio.run(
-        _run_with_sdk(
+        await _run_with_sdk(
             repo_path,
             settings,
             payload["system_message"],
             payload["user_message"]["content"],
             status_msg="Auditing docs…",
         )
-    )
+
+    _run_async(_audit_flow())
 
 
 # ── chat ─────────────────────────────────────────────────────────────
@@ -852,13 +1091,20 @@ def chat(ctx: click.Context, skip_confirm: bool) -> None:
     if not _confirm_ai_action(settings, "chat", skip_confirm=skip_confirm):
         return
 
-    with console.status("[bold cyan]Scanning repository…[/]"):
-        agent = CodeCompassAgent(repo_path, settings=settings)
-        summary = asyncio.run(agent.onboard())
-    print_onboarding_summary(summary)
+    async def _chat_flow() -> None:
+        with _console().status("[bold cyan]Scanning repository…[/]"):
+            agent = CodeCompassAgent(repo_path, settings=settings)
+            summary = await agent.scan()
+        # Render the summary while the graph finishes building
+        print_onboarding_summary(summary)
+
+        sys_msg = _system_message(agent, "onboarding")
+        await agent.onboard()
+        if sys_msg is None:
+            return
+        await _interactive_session(repo_path, settings, sys_msg, kg=agent.graph)
 
-    sys_msg = agent.system_message("onboarding")
-    asyncio.run(_interactive_session(repo_path, settings, sys_msg))
+    _run_async(_chat_flow())
 
 
 # ── graph ────────────────────────────────────────────────────────────
@@ -899,42 +1145,43 @@ def graph(ctx: click.Context, output_path: str | None, fmt: str) -> None:
     all_mods = kg.all_modules()
 
     # Detect the project package name from the repo
-    # (first dotted module that has sub-modules)
-    project_root_pkg = None
-    for m in all_mods:
-        parts = m.split(".")
-        if len(parts) >= 2:
-            candidate = parts[0]
-            # Check if multiple modules share this prefix
-            count = sum(1 for x in all_mods if x.startswith(candidate + "."))
-            if count >= 3:
-                project_root_pkg = candidate
-                break
+    # (first dotted module whose top-level package has 3+ sub-modules).
+    # Counter keeps first-seen order, so this matches the module order.
+    root_counts = Counter(m.split(".", 1)[0] for m in all_mods if "." in m)
+    project_root_pkg = next(
+        (root for root, count in root_counts.items() if count >= 3), None
+    )
 
     if not project_root_pkg:
-        console.print("[yellow]Could not detect project package. Showing all modules.[/]")
+        _console().print("[yellow]Could not detect project package. Showing all modules.[/]")
         project_root_pkg = ""
 
-    project_mods = sorted(set(
+    # all_modules() is already sorted and unique, so filtering keeps that
+    project_mods = [
         m for m in all_mods
-        if m.startswith(project_root_pkg) and not m.startswith(("tests.", "e2e_"))
-    ))
+        if m.startswith(project_root_pkg) and not m.startswith(_NON_PROJECT_PREFIXES)
+    ]
+
+    # Internal (project-only) dependencies, looked up once for either format
+    project_mod_set = set(project_mods)
+    deps_map = {
+        mod: sorted(d for d in kg.dependencies(mod) if d in project_mod_set)
+        for mod in project_mods
+    }
 
+    buf = io.StringIO()
+    w = buf.write
     if fmt == "text":
-        lines = ["# Module Dependency Graph", ""]
-        project_mod_set = set(project_mods)
-        for mod in project_mods:
-            deps = kg.dependencies(mod)
-            internal_deps = sorted(d for d in deps if d in project_mod_set)
+        w("# Module Dependency Graph\n\n")
+        for mod, internal_deps in deps_map.items():
             if internal_deps:
-                lines.append(f"{mod}:")
+                w(f"{mod}:\n")
                 for d in internal_deps:
-                    lines.append(f"  → {d}")
-                lines.append("")
-        output = "\n".join(lines)
+                    w(f"  → {d}\n")
+                w("\n")
     else:
         # Mermaid flowchart
-        lines = ["```mermaid", "flowchart TD"]
+        w("```mermaid\nflowchart TD\n")
 
         # Create sanitized IDs for Mermaid
         def _mid(m: str) -> str:
@@ -953,26 +1200,24 @@ def graph(ctx: click.Context, output_path: str | None, fmt: str) -> None:
         # Add subgraphs for each layer
         for layer, mods in sorted(layers.items()):
             label = layer.split(".")[-1].title()
-            lines.append(f"    subgraph {label}")
+            w(f"    subgraph {label}\n")
             for mod in mods:
                 short = mod.split(".")[-1]
-                lines.append(f"        {_mid(mod)}[{short}]")
-            lines.append("    end")
+                w(f"        {_mid(mod)}[{short}]\n")
+            w("    end\n")
 
         # Add edges (only internal project deps)
-        project_mod_set = set(project_mods)
-        for mod in project_mods:
-            deps = kg.dependencies(mod)
-            for dep in sorted(deps):
-                if dep in project_mod_set:
-                    lines.append(f"    {_mid(mod)} --> {_mid(dep)}")
+        for mod, internal_deps in deps_map.items():
+            for dep in internal_deps:
+                w(f"    {_mid(mod)} --> {_mid(dep)}\n")
 
-        lines.append("```")
-        output = "\n".join(lines)
+        w("```\n")
+    # Every line is newline-terminated; drop the last one, as "\n".join() would
+    output = buf.getvalue()[:-1]
 
     if output_path:
         Path(output_path).write_text(output, encoding="utf-8")
-        console.print(f"[green]Dependency graph written to {output_path}[/]")
+        _console().print(f"[green]Dependency graph written to {output_path}[/]")
     else:
         click.echo(output)
 
@@ -1011,50 +1256,66 @@ def diff_explain(ctx: click.Context, commits: int | None, skip_confirm: bool) ->
     try:
         git = GitOps(repo_path)
     except GitOpsError as exc:
-        console.print(f"[red]Error:[/] {exc}")
+        _console().print(f"[red]Error:[/] {exc}")
         return
 
-    # Gather recent commits
-    with console.status(f"[bold cyan]Gathering last {commits} commits…[/]"):
-        log = git.log(max_count=commits)
-    if not log:
-        console.print("[yellow]No commits found.[/]")
-        return
+    async def _diff_explain_flow() -> None:
+        # Gather recent commits
+        with _console().status(f"[bold cyan]Gathering last {commits} commits…[/]"):
+            log = git.log(max_count=commits)
+            diffs = await _fetch_commit_diffs(git, log) if log else []
+        if not log:
+            _console().print("[yellow]No commits found.[/]")
+            return
 
-    # Build context from commits + diffs
-    context_parts = ["## Recent Changes\n"]
-    for entry in log:
-        context_parts.append(
-            f"### Commit `{entry['short_hash']}` — {entry['message']}\n"
-            f"- **Author:** {entry['author']}\n"
-            f"- **Date:** {entry['date']}\n"
-        )
-        try:
-            diff = git.diff(f"{entry['hash']}~1", entry['hash'])
-            if diff:
+        # Build context from commits + diffs
+        context_parts = ["## Recent Changes\n"]
+        for entry, diff in zip(log, diffs):
+            if isinstance(diff, BaseException):
+                body = "\n_(diff not available)_\n"
+            elif diff:
                 # Truncate very long diffs
                 if len(diff) > 2000:
                     diff = diff[:2000] + "\n... (truncated)"
-                context_parts.append(f"```diff\n{diff}\n```\n")
-        except Exception:
-            context_parts.append("_(diff not available)_\n")
-
-    diff_context = "\n".join(context_parts)
-
-    prompt = (
-        "Analyze these recent code changes and provide:\n"
-        "1. A high-level summary of what changed\n"
-        "2. WHY these changes were likely made (based on commit messages and code)\n"
-        "3. Impact assessment — what parts of the system were affected\n"
-        "4. What a new developer should understand about these changes\n\n"
-        f"{diff_context}"
-    )
+                body = f"\n```diff\n{diff}\n```\n"
+            else:
+                body = ""
+            context_parts.append(_COMMIT_CONTEXT.format_map({**entry, "body": body}))
+
+        diff_context = "\n".join(context_parts)
+
+        prompt = (
+            "Analyze these recent code changes and provide:\n"
+            "1. A high-level summary of what changed\n"
+            "2. WHY these changes were likely made (based on commit messages and code)\n"
+            "3. Impact assessment — what parts of the system were affected\n"
+            "4. What a new developer should understand about these changes\n\n"
+            f"{diff_context}"
+        )
+
+        agent = CodeCompassAgent(repo_path, settings=settings)
+        sys_msg = _system_message(agent, "onboarding")
+        if sys_msg is None:
+            return
+
+        await _run_with_sdk(repo_path, settings, sys_msg, prompt,
+                            status_msg="Analyzing changes…", kg=agent.graph)
 
-    agent = CodeCompassAgent(repo_path, settings=settings)
-    sys_msg = agent.system_message("onboarding")
+    _run_async(_diff_explain_flow())
 
-    asyncio.run(_run_with_sdk(repo_path, settings, sys_msg, prompt,
-                              status_msg="Analyzing changes…"))
+
+async def _fetch_commit_diffs(git, log: list[dict]) -> list[str | BaseException]:
+    """Fetch the diff of every commit in *log* concurrently.
+
+    Each ``git diff`` runs in a worker thread; failures are returned in
+    place of the diff text rather than raised.
+    """
+    import asyncio
+
+    return await asyncio.gather(
+        *(asyncio.to_thread(git.diff, f"{entry['hash']}~1", entry["hash"]) for entry in log),
+        return_exceptions=True,
+    )
 
 
 # ── tui ──────────────────────────────────────────────────────────────
@@ -1073,18 +1334,46 @@ def tui(ctx: click.Context, skip_confirm: bool) -> None:
     💎 Chat interactions in the TUI use the Copilot model and may
        consume premium requests depending on the selected model.
     """
-    from codecompass.ui.app import CodeCompassApp
-
     settings: Settings = ctx.obj["settings"]
     repo_path: Path = ctx.obj["repo_path"]
 
     if not _confirm_ai_action(settings, "tui", skip_confirm=skip_confirm):
         return
 
+    # Importing Textual takes a noticeable moment; show it is loading
+    with _console().status("[dim]Loading UI…[/]"):
+        from codecompass.ui.app import CodeCompassApp
+
     app = CodeCompassApp(repo_path=repo_path, settings=settings)
     app.run()
 
 
+# ── cache ────────────────────────────────────────────────────────────
+
+
+@main.group()
+def cache() -> None:
+    """Manage the on-disk analysis cache."""
+    pass
+
+
+@cache.command(name="clear")
+@click.option("--all", "all_repos", is_flag=True, help="Clear the cache for every repository.")
+@click.pass_context
+def cache_clear(ctx: click.Context, all_repos: bool) -> None:
+    """Delete cached scan results and knowledge graphs.
+
+    Clears the current repository's entries unless --all is given.
+    """
+    from codecompass.utils.cache import clear_cache
+
+    removed = clear_cache(None if all_repos else ctx.obj["repo_path"])
+    if removed:
+        _console().print("[green]Cache cleared.[/]")
+    else:
+        _console().print("[dim]Nothing to clear.[/]")
+
+
 # ── config ───────────────────────────────────────────────────────────
 
 
@@ -1108,13 +1397,13 @@ def config_init(ctx: click.Context, force: bool, global_scope: bool) -> None:
     Interactively prompts for key settings (model, log level, etc.)
     and writes them to .codecompass.toml in the current directory.
     """
-    from codecompass.utils.config import config_path, global_config_path, write_config
+    from codecompass.utils.config import Settings, config_path, global_config_path, write_config
 
     repo_path: Path = ctx.obj["repo_path"]
     target = global_config_path() if global_scope else config_path(repo_path)
 
     if target.is_file() and not force:
-        console.print(
+        _console().print(
             f"[yellow]Config already exists:[/] {target}\n"
             "Use [bold]--force[/] to overwrite."
         )
@@ -1137,7 +1426,7 @@ def config_init(ctx: click.Context, force: bool, global_scope: bool) -> None:
         max_file_size_kb=max_file_size_kb,
     )
     write_config(settings, target)
-    console.print(f"\n[green]✓[/] Config written to [bold]{target}[/]")
+    _console().print(f"\n[green]✓[/] Config written to [bold]{target}[/]")
 
 
 @config.command(name="show")
@@ -1148,7 +1437,7 @@ def config_show(ctx: click.Context, global_scope: bool) -> None:
 
     Shows all settings with their values and sources (default, env, file, CLI).
     """
-    from codecompass.utils.config import config_path, global_config_path
+    from codecompass.utils.config import Settings, _load_toml, config_path, global_config_path
 
     settings: Settings = ctx.obj["settings"]
     repo_path: Path = ctx.obj["repo_path"]
@@ -1163,14 +1452,9 @@ def config_show(ctx: click.Context, global_scope: bool) -> None:
     table.add_column("Source", style="dim")
 
     # Determine sources
-    repo_vals: dict = {}
-    global_vals: dict = {}
-    if repo_cfg_file.is_file():
-        from codecompass.utils.config import _parse_toml
-        repo_vals = _parse_toml(repo_cfg_file)
-    if global_cfg_file.is_file():
-        from codecompass.utils.config import _parse_toml
-        global_vals = _parse_toml(global_cfg_file)
+    # Files parsed by Settings.load() in main() are served from its cache
+    repo_vals = _load_toml(repo_cfg_file)
+    global_vals = _load_toml(global_cfg_file)
 
     import os
 
@@ -1180,9 +1464,21 @@ def config_show(ctx: click.Context, global_scope: bool) -> None:
         "tree_depth": "CODECOMPASS_TREE_DEPTH",
         "max_file_size_kb": "CODECOMPASS_MAX_FILE_SIZE_KB",
         "github_token": "GITHUB_TOKEN",
+        "parallel_index": "CODECOMPASS_PARALLEL_INDEX",
     }
+    fields = ("model", "log_level", "tree_depth", "max_file_size_kb", "parallel_index", "repo_path", "github_token")
+
+    # Env vars only count for the resolved view.  Look up just the mapped
+    # keys, once; copying os.environ would decode every variable.
+    env_sources: dict[str, str] = {}
+    if not global_scope:
+        env_sources = {
+            field_name: env_key
+            for field_name, env_key in env_map.items()
+            if os.environ.get(env_key)
+        }
 
-    defaults = Settings()
+    defaults = Settings().model_dump(include=set(fields))
 
     display_settings = settings
     if global_scope:
@@ -1191,11 +1487,11 @@ def config_show(ctx: click.Context, global_scope: bool) -> None:
             global_only_vals["repo_path"] = settings.repo_path
         display_settings = Settings(**global_only_vals)
 
-    for field_name in ["model", "log_level", "tree_depth", "max_file_size_kb", "repo_path", "github_token"]:
+    for field_name in fields:
         val = getattr(display_settings, field_name)
         # Determine source
-        env_key = env_map.get(field_name)
-        if not global_scope and env_key and os.environ.get(env_key):
+        env_key = env_sources.get(field_name)
+        if env_key:
             source = f"env ({env_key})"
         elif global_scope and field_name in global_vals:
             source = f"file ({global_cfg_file.name})"
@@ -1203,7 +1499,7 @@ def config_show(ctx: click.Context, global_scope: bool) -> None:
             source = f"file ({repo_cfg_file.name})"
         elif not global_scope and field_name in global_vals:
             source = f"file ({global_cfg_file.name})"
-        elif val == getattr(defaults, field_name):
+        elif val == defaults[field_name]:
             source = "default"
         else:
             source = "CLI flag"
@@ -1215,14 +1511,14 @@ def config_show(ctx: click.Context, global_scope: bool) -> None:
 
         table.add_row(field_name, display_val, source)
 
-    console.print()
-    console.print(table)
+    _console().print()
+    _console().print(table)
     if global_scope:
-        console.print(f"\n[dim]Global config file: {global_cfg_file}{'  ✓ exists' if global_cfg_file.is_file() else '  (not found)'}[/]")
+        _console().print(f"\n[dim]Global config file: {global_cfg_file}{'  ✓ exists' if global_cfg_file.is_file() else '  (not found)'}[/]")
     else:
-        console.print(f"\n[dim]Repo config file: {repo_cfg_file}{'  ✓ exists' if repo_cfg_file.is_file() else '  (not found)'}[/]")
-        console.print(f"[dim]Global config file: {global_cfg_file}{'  ✓ exists' if global_cfg_file.is_file() else '  (not found)'}[/]")
-    console.print()
+        _console().print(f"\n[dim]Repo config file: {repo_cfg_file}{'  ✓ exists' if repo_cfg_file.is_file() else '  (not found)'}[/]")
+        _console().print(f"[dim]Global config file: {global_cfg_file}{'  ✓ exists' if global_cfg_file.is_file() else '  (not found)'}[/]")
+    _console().print()
 
 
 @config.command(name="set")
@@ -1240,11 +1536,13 @@ def config_set(ctx: click.Context, global_scope: bool, key: str, value: str | No
         codecompass config set log_level DEBUG
         codecompass config set tree_depth 6
     """
+    from rich.table import Table
+
     from codecompass.utils.config import update_config_key, config_path, global_config_path
 
-    valid_keys = {"model", "log_level", "tree_depth", "max_file_size_kb", "github_token"}
+    valid_keys = {"model", "log_level", "tree_depth", "max_file_size_kb", "parallel_index", "github_token"}
     if key not in valid_keys:
-        console.print(
+        _console().print(
             f"[red]Invalid key:[/] {key}\n"
             f"Valid keys: {', '.join(sorted(valid_keys))}"
         )
@@ -1262,9 +1560,9 @@ def config_set(ctx: click.Context, global_scope: bool, key: str, value: str | No
         for name, premium in models:
             rate_display = "free" if premium == "0x" else premium
             table.add_row(name, rate_display)
-        console.print()
-        console.print(table)
-        console.print()
+        _console().print()
+        _console().print(table)
+        _console().print()
 
         default_model = settings.model if settings.model in model_choices else model_choices[0]
         value = click.prompt(
@@ -1283,7 +1581,7 @@ def config_set(ctx: click.Context, global_scope: bool, key: str, value: str | No
     repo_path: Path = ctx.obj["repo_path"]
     target = global_config_path() if global_scope else config_path(repo_path)
     update_config_key(key, value, target)
-    console.print(f"[green]✓[/] Set [bold]{key}[/] = [cyan]{value}[/] in {target}")
+    _console().print(f"[green]✓[/] Set [bold]{key}[/] = [cyan]{value}[/] in {target}")
 
 
 @config.command(name="path")
@@ -1312,6 +1610,8 @@ def config_set_model(ctx: click.Context, global_scope: bool, model_name: str | N
         codecompass config set-model gpt-4.1
         codecompass config set-model          # interactive picker
     """
+    from rich.table import Table
+
     from codecompass.utils.config import update_config_key, config_path, global_config_path
 
     settings: Settings = ctx.obj["settings"]
@@ -1327,9 +1627,9 @@ def config_set_model(ctx: click.Context, global_scope: bool, model_name: str | N
         for name, premium in models:
             rate_display = "free" if premium == "0x" else premium
             table.add_row(name, rate_display)
-        console.print()
-        console.print(table)
-        console.print()
+        _console().print()
+        _console().print(table)
+        _console().print()
 
         default_model = settings.model if settings.model in model_choices else model_choices[0]
         model_name = click.prompt(
@@ -1341,7 +1641,7 @@ def config_set_model(ctx: click.Context, global_scope: bool, model_name: str | N
 
     target = global_config_path() if global_scope else config_path(repo_path)
     update_config_key("model", model_name, target)
-    console.print(f"[green]✓[/] Model set to [bold cyan]{model_name}[/] in {target}")
+    _console().print(f"[green]✓[/] Model set to [bold cyan]{model_name}[/] in {target}")
 
 
 # ── _export_onboarding (helper for onboard --output) ────────────────
@@ -1363,6 +1663,8 @@ def _export_onboarding(
     kg = agent.graph  # type: ignore[attr-defined]
 
     if fmt == "json":
+        # One entry per (source, target) pair; later edges win, as before
+        unique_edges = {(e.source_module, e.target_module): e for e in kg.imports}
         data = {
             "name": summary.name,  # type: ignore[attr-defined]
             "root": summary.root,  # type: ignore[attr-defined]
@@ -1376,17 +1678,25 @@ def _export_onboarding(
             "has_ci": summary.has_ci,  # type: ignore[attr-defined]
             "has_readme": summary.has_readme,  # type: ignore[attr-defined]
             "has_contributing": summary.has_contributing,  # type: ignore[attr-defined]
-            "modules": sorted(kg.all_modules()),
+            "modules": kg.all_modules(),  # memoized and already sorted
             "symbols": [
                 {"name": s.name, "kind": s.kind, "file": s.file, "line": s.line}
                 for s in kg.symbols.values()
             ],
-            "imports": list({
-                (e.source_module, e.target_module): {"source": e.source_module, "target": e.target_module, "names": e.imported_names}
-                for e in kg.imports
-            }.values()),
+            "imports": [
+                {"source": e.source_module, "target": e.target_module, "names": e.imported_names}
+                for e in unique_edges.values()
+            ],
         }
-        output = json_mod.dumps(data, indent=2)
+        try:
+            import orjson  # type: ignore[import-not-found]
+        except ModuleNotFoundError:
+            # Stream to the file rather than building the whole JSON string first
+            with Path(output_path).open("w", encoding="utf-8") as fh:
+                json_mod.dump(data, fh, indent=2, ensure_ascii=False)
+        else:
+            # orjson encodes natively straight to UTF-8 bytes
+            Path(output_path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
     else:
         # Markdown export
         lines = [
@@ -1401,25 +1711,26 @@ def _export_onboarding(
             "## Modules",
             "",
         ]
-        all_modules = sorted(kg.all_modules())
-        root_counts: dict[str, int] = {}
-        for module_name in all_modules:
-            root = module_name.split(".")[0]
-            if root.startswith(("tests", "e2e_")):
-                continue
-            root_counts[root] = root_counts.get(root, 0) + 1
+        # Memoized and already sorted; shared, so it must not be mutated
+        all_modules = kg.all_modules()
+        root_counts = Counter(
+            root for root in (m.split(".", 1)[0] for m in all_modules)
+            if not root.startswith(("tests", "e2e_"))
+        )
 
         if root_counts:
-            project_root = max(root_counts, key=root_counts.get)
+            # most_common() breaks ties by first occurrence, like max() did
+            project_root = root_counts.most_common(1)[0][0]
+            project_prefix = project_root + "."
             project_modules = [
                 m for m in all_modules
-                if (m == project_root or m.startswith(project_root + "."))
-                and not m.startswith(("tests.", "e2e_"))
+                if (m == project_root or m.startswith(project_prefix))
+                and not m.startswith(_NON_PROJECT_PREFIXES)
             ]
         else:
             project_modules = [
                 m for m in all_modules
-                if not m.startswith(("tests.", "e2e_"))
+                if not m.startswith(_NON_PROJECT_PREFIXES)
             ]
         for mod in project_modules:
             lines.append(f"- `{mod}`")
@@ -1431,12 +1742,19 @@ def _export_onboarding(
             "| Symbol | Kind | File | Line |",
             "|--------|------|------|------|",
         ]
-        public_symbols = sorted(
-            (s for s in kg.symbols.values()
-             if not s.name.startswith("_")),
-            key=lambda x: (x.file, x.line or 0),
+        # Decorate once so the sort key is a C-level itemgetter, not a lambda.
+        # Only 80 rows are shown: nsmallest() equals sorted()[:80] without
+        # sorting every symbol.
+        rows = heapq.nsmallest(
+            80,
+            (
+                (s.file, s.line or 0, s)
+                for s in kg.symbols.values()
+                if not s.name.startswith("_")
+            ),
+            key=itemgetter(0, 1),
         )
-        for s in public_symbols[:80]:
+        for _, _, s in rows:
             lines.append(f"| `{s.name}` | {s.kind} | `{s.file}` | {s.line or '-'} |")
 
         lines += [
@@ -1444,23 +1762,12 @@ def _export_onboarding(
             "## Dependencies",
             "",
         ]
-        seen_deps: set[tuple[str, str]] = set()
-        for edge in kg.imports:
-            key = (edge.source_module, edge.target_module)
-            if key not in seen_deps:
-                seen_deps.add(key)
-                if edge.target_module.startswith(("__future__", "os", "sys",
-                                                   "pathlib", "json", "enum",
-                                                   "datetime", "logging",
-                                                   "asyncio", "typing",
-                                                   "subprocess", "ast",
-                                                   "dataclasses", "re",
-                                                   "io", "functools",
-                                                   "collections", "abc")):
-                    continue
-                lines.append(f"- `{edge.source_module}` → `{edge.target_module}`")
+        unique_edges = dict.fromkeys((e.source_module, e.target_module) for e in kg.imports)
+        for source, target in unique_edges:
+            if target.split(".", 1)[0] in _STDLIB_MODULES:
+                continue
+            lines.append(f"- `{source}` → `{target}`")
 
-        output = "\n".join(lines)
+        Path(output_path).write_text("\n".join(lines), encoding="utf-8")
 
-    Path(output_path).write_text(output, encoding="utf-8")
-    console.print(f"[green]Exported to {output_path}[/]")
+    _console().print(f"[green]Exported to {output_path}[/]")
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from typing import Any
 
 import httpx
@@ -13,6 +15,36 @@ logger = logging.getLogger(__name__)
 
 _GITHUB_API = "https://api.github.com"
 
+# Requests allowed in flight at once per client (GitHub's secondary rate
+# limits penalise bursts of concurrent calls)
+_MAX_CONCURRENT_REQUESTS = 10
+
+# Longest rate-limit wait (seconds) honoured before giving up on a request
+_MAX_RATE_LIMIT_WAIT = 60.0
+
+
+def _rate_limit_wait(resp: httpx.Response) -> float | None:
+    """Seconds to wait before retrying a rate-limited response, if known.
+
+    Uses ``Retry-After`` (secondary limits) or, once the primary quota is
+    exhausted, ``X-RateLimit-Reset``.  Returns ``None`` when the response
+    is not a rate-limit rejection or the wait would be too long.
+    """
+    if resp.status_code not in (403, 429):
+        return None
+    headers = resp.headers
+    try:
+        if "retry-after" in headers:
+            wait = float(headers["retry-after"])
+        elif headers.get("x-ratelimit-remaining") == "0" and "x-ratelimit-reset" in headers:
+            wait = float(headers["x-ratelimit-reset"]) - time.time()
+        else:
+            return None
+    except ValueError:
+        return None
+    wait = max(0.0, wait)
+    return wait if wait <= _MAX_RATE_LIMIT_WAIT else None
+
 
 class GitHubClientError(Exception):
     """Raised when a GitHub API request fails."""
@@ -49,6 +81,8 @@ class GitHubClient:
             headers=headers,
             timeout=30.0,
         )
+        self._semaphore: asyncio.Semaphore | None = None
+        self._semaphore_loop: asyncio.AbstractEventLoop | None = None
 
     # -- lifecycle -----------------------------------------------------------
 
@@ -63,10 +97,29 @@ class GitHubClient:
 
     # -- helpers -------------------------------------------------------------
 
+    def _limiter(self) -> asyncio.Semaphore:
+        """Return the request semaphore, re-created if the event loop changed."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _request(self, url: str, params: dict[str, Any] | None = None) -> httpx.Response:
+        """Issue a GET request, retrying once after a short rate-limit wait."""
+        async with self._limiter():
+            resp = await self._client.get(url, params=params)
+            wait = _rate_limit_wait(resp)
+            if wait is not None:
+                logger.warning("GitHub rate limit hit; retrying %s in %.1fs", url, wait)
+                await asyncio.sleep(wait)
+                resp = await self._client.get(url, params=params)
+        return resp
+
     async def _get(self, path: str, params: dict[str, Any] | None = None) -> Any:
         """Issue a GET request and return parsed JSON."""
         url = f"/repos/{self.owner}/{self.repo}{path}"
-        resp = await self._client.get(url, params=params)
+        resp = await self._request(url, params=params)
         if resp.status_code >= 400:
             raise GitHubClientError(
                 f"GitHub API error {resp.status_code}: {resp.text[:300]}"
@@ -113,7 +166,7 @@ class GitHubClient:
         ``query`` is appended to a repo-scoped qualifier automatically.
         """
         full_query = f"repo:{self.owner}/{self.repo} {query}"
-        resp = await self._client.get(
+        resp = await self._request(
             "/search/issues",
             params={"q": full_query, "per_page": per_page},
         )
@@ -290,8 +290,18 @@ class GitOps:
         """Get a short status summary."""
         return self._run(["git", "status", "--short"], check=False)
 
+    def is_clean(self) -> bool:
+        """Whether the working tree has no staged, unstaged, or untracked changes."""
+        return not self.status().strip()
+
     # ── branch info ──────────────────────────────────────────────────
 
+    def head_sha(self) -> str | None:
+        """Get the full SHA of ``HEAD``, or ``None`` if there are no commits."""
+        output = self._run(["git", "rev-parse", "HEAD"], check=False)
+        sha = output.strip()
+        return sha if len(sha) == 40 else None
+
     def current_branch(self) -> str:
         """Get the current branch name."""
         output = self._run(
@@ -4,12 +4,18 @@ from __future__ import annotations
 
 import ast
 import logging
+from concurrent.futures import Executor
 from pathlib import Path
 
 from codecompass.models import ImportEdge, SymbolNode
 
 logger = logging.getLogger(__name__)
 
+_SKIP_PARTS: set[str] = {"node_modules", "__pycache__", "venv", ".venv"}
+
+# (kind, name, line, file, doc_snippet) as returned by query_summary()
+SymbolSummary = tuple[str, str, int | None, str, str]
+
 
 class KnowledgeGraph:
     """Builds and queries an in-memory graph of Python source symbols and
@@ -25,29 +31,48 @@ class KnowledgeGraph:
         # Adjacency lists for quick traversal
         self._deps: dict[str, set[str]] = {}       # module → modules it imports
         self._rdeps: dict[str, set[str]] = {}       # module → modules that import it
+        self._modules: list[str] | None = None       # memoized all_modules()
+        self._queries: dict[str, list[SymbolNode]] = {}  # memoized query()
+        self._summaries: dict[tuple[str, int], list[SymbolSummary]] = {}  # memoized query_summary()
 
     # ------------------------------------------------------------------
     # Building
     # ------------------------------------------------------------------
 
-    def build(self, repo_root: str | Path) -> None:
+    def build(self, repo_root: str | Path, *, executor: Executor | None = None) -> None:
         """Scan all Python files under *repo_root* and populate the graph.
 
         Args:
             repo_root: The repository root directory.
+            executor: Optional executor (typically a ``ProcessPoolExecutor``)
+                used to index one shard per top-level package in parallel.
+                The graph is built serially when omitted.
         """
         self.symbols.clear()
         self.imports.clear()
         self._deps.clear()
         self._rdeps.clear()
+        self._modules = None
+        self._queries.clear()
+        self._summaries.clear()
 
         root = Path(repo_root).resolve()
-        for py_file in root.rglob("*.py"):
-            # Skip hidden and venv directories
-            parts = py_file.relative_to(root).parts
-            if any(p.startswith(".") or p in {"node_modules", "__pycache__", "venv", ".venv"} for p in parts):
-                continue
-            self._index_file(py_file, root)
+        files = self._source_files(root)
+
+        if executor is None:
+            for py_file in files:
+                self._index_file(py_file, root)
+        else:
+            futures = [
+                executor.submit(_index_shard, str(root), [str(f) for f in shard])
+                for shard in self._shard_files(files, root)
+            ]
+            # Merge in submission order so rebuilds are deterministic
+            for future in futures:
+                symbols, imports = future.result()
+                self.symbols.update(symbols)
+                for edge in imports:
+                    self._add_edge(edge)
 
         logger.info(
             "Knowledge graph built: %d symbols, %d import edges",
@@ -55,6 +80,23 @@ class KnowledgeGraph:
             len(self.imports),
         )
 
+    # ------------------------------------------------------------------
+    # Pickling
+    # ------------------------------------------------------------------
+
+    def __getstate__(self) -> dict[str, object]:
+        # Memoized lookups are rebuilt on demand, so keep them out of pickles
+        state = self.__dict__.copy()
+        state["_queries"] = {}
+        state["_summaries"] = {}
+        return state
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        self.__dict__.update(state)
+        # Graphs cached before a memo was added lack its attribute
+        self.__dict__.setdefault("_queries", {})
+        self.__dict__.setdefault("_summaries", {})
+
     # ------------------------------------------------------------------
     # Querying
     # ------------------------------------------------------------------
@@ -62,11 +104,35 @@ class KnowledgeGraph:
     def query(self, symbol_name: str) -> list[SymbolNode]:
         """Find symbols whose name contains *symbol_name* (case-insensitive).
 
+        Results are memoized per build and shared between callers, so the
+        returned list must not be mutated.
+
         Returns:
             Matching ``SymbolNode`` objects.
         """
         needle = symbol_name.lower()
-        return [s for s in self.symbols.values() if needle in s.name.lower()]
+        found = self._queries.get(needle)
+        if found is None:
+            found = [s for s in self.symbols.values() if needle in s.name.lower()]
+            self._queries[needle] = found
+        return found
+
+    def query_summary(self, symbol_name: str, limit: int) -> list[SymbolSummary]:
+        """Compact rows for the first *limit* results of :meth:`query`.
+
+        Each row is ``(kind, name, line, file, doc_snippet)``, where
+        *doc_snippet* holds the first 100 characters of the docstring.
+        Rows are memoized per build and must not be mutated.
+        """
+        key = (symbol_name.lower(), limit)
+        rows = self._summaries.get(key)
+        if rows is None:
+            rows = [
+                (s.kind, s.name, s.line, s.file, s.docstring[:100])
+                for s in self.query(symbol_name)[:limit]
+            ]
+            self._summaries[key] = rows
+        return rows
 
     def dependencies(self, module: str) -> set[str]:
         """Return the set of modules that *module* imports."""
@@ -77,12 +143,23 @@ class KnowledgeGraph:
         return self._rdeps.get(module, set())
 
     def all_modules(self) -> list[str]:
-        """Return a sorted list of all indexed module names."""
-        modules: set[str] = set()
-        for edge in self.imports:
-            modules.add(edge.source_module)
-            modules.add(edge.target_module)
-        return sorted(modules)
+        """Return a sorted list of all indexed module names.
+
+        The list is computed once per build and shared between callers,
+        so it must not be mutated.
+        """
+        if self._modules is None:
+            modules: set[str] = set()
+            for edge in self.imports:
+                modules.add(edge.source_module)
+                modules.add(edge.target_module)
+            self._modules = sorted(modules)
+        return self._modules
+
+    @property
+    def import_count(self) -> int:
+        """Number of import edges in the graph."""
+        return len(self.imports)
 
     # ------------------------------------------------------------------
     # Internal: file indexing
@@ -132,15 +209,44 @@ class KnowledgeGraph:
     # Internal helpers
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _source_files(root: Path) -> list[Path]:
+        """Collect indexable Python files, skipping hidden and venv dirs."""
+        files: list[Path] = []
+        for py_file in root.rglob("*.py"):
+            parts = py_file.relative_to(root).parts
+            if any(p.startswith(".") or p in _SKIP_PARTS for p in parts):
+                continue
+            files.append(py_file)
+        return files
+
+    @staticmethod
+    def _shard_files(files: list[Path], root: Path) -> list[list[Path]]:
+        """Partition *files* by top-level package (``src/`` layout aware)."""
+        shards: dict[str, list[Path]] = {}
+        for path in files:
+            parts = path.relative_to(root).parts
+            if len(parts) > 2 and parts[0] == "src":
+                key = parts[1]
+            else:
+                key = parts[0] if len(parts) > 1 else ""
+            shards.setdefault(key, []).append(path)
+        return list(shards.values())
+
     def _add_import(self, source: str, target: str, names: list[str]) -> None:
-        edge = ImportEdge(
-            source_module=source,
-            target_module=target,
-            imported_names=names,
+        self._add_edge(
+            ImportEdge(
+                source_module=source,
+                target_module=target,
+                imported_names=names,
+            )
         )
+
+    def _add_edge(self, edge: ImportEdge) -> None:
+        self._modules = None
         self.imports.append(edge)
-        self._deps.setdefault(source, set()).add(target)
-        self._rdeps.setdefault(target, set()).add(source)
+        self._deps.setdefault(edge.source_module, set()).add(edge.target_module)
+        self._rdeps.setdefault(edge.target_module, set()).add(edge.source_module)
 
     @staticmethod
     def _path_to_module(path: Path, root: Path) -> str:
@@ -158,3 +264,15 @@ class KnowledgeGraph:
         if parts and parts[0] == "src":
             parts = parts[1:]
         return ".".join(parts)
+
+
+def _index_shard(root: str, files: list[str]) -> tuple[dict[str, SymbolNode], list[ImportEdge]]:
+    """Index a shard of files (runs inside an executor worker).
+
+    Module-level so it can be pickled by a ``ProcessPoolExecutor``.
+    """
+    graph = KnowledgeGraph()
+    root_path = Path(root)
+    for file in files:
+        graph._index_file(Path(file), root_path)
+    return graph.symbols, graph.imports
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import Executor
 from pathlib import Path
 
 from codecompass.models import FileInfo, FrameworkInfo, Language, RepoSummary
@@ -139,8 +140,14 @@ class RepoScanner:
     # Public
     # ------------------------------------------------------------------
 
-    def scan(self) -> RepoSummary:
-        """Perform a full scan and return a ``RepoSummary``."""
+    def scan(self, *, executor: Executor | None = None) -> RepoSummary:
+        """Perform a full scan and return a ``RepoSummary``.
+
+        Args:
+            executor: Optional (thread) executor used to analyze files
+                concurrently.  Results are still collected in walk order,
+                so the summary is identical to a serial scan.
+        """
         files: list[FileInfo] = []
         languages: set[Language] = set()
         entry_points: list[str] = []
@@ -148,9 +155,14 @@ class RepoScanner:
         test_dirs: set[str] = set()
         total_lines = 0
 
-        for path in self._walk():
-            rel = path.relative_to(self.root).as_posix()
-            info = self._analyze_file(path, rel)
+        paths = self._walk()
+        rels = [path.relative_to(self.root).as_posix() for path in paths]
+        if executor is None:
+            infos = map(self._analyze_file, paths, rels)
+        else:
+            infos = executor.map(self._analyze_file, paths, rels)
+
+        for rel, info in zip(rels, infos):
             files.append(info)
 
             if info.language:
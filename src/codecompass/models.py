@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from datetime import datetime
 from enum import Enum
 
@@ -132,25 +133,31 @@ class RepoSummary(BaseModel):
 
     def to_text(self) -> str:
         """Render the summary as a human-readable text block."""
-        lines: list[str] = [
-            f"**{self.name}**",
-            "",
-            f"- Root: `{self.root}`",
-            f"- Languages: {', '.join(lang.value for lang in self.languages) or 'unknown'}",
-            f"- Frameworks: {', '.join(f.name for f in self.frameworks) or 'none detected'}",
-            f"- Files: {self.total_files}  |  Lines: {self.total_lines}",
-        ]
+        return "".join(self.to_text_iter())
+
+    def to_text_iter(self) -> Iterator[str]:
+        """Yield the :meth:`to_text` rendering in chunks.
+
+        Lets callers splice the summary into a larger prompt without first
+        materializing it as a separate string.
+        """
+        yield f"**{self.name}**\n"
+        yield f"\n- Root: `{self.root}`"
+        yield f"\n- Languages: {', '.join(lang.value for lang in self.languages) or 'unknown'}"
+        yield f"\n- Frameworks: {', '.join(f.name for f in self.frameworks) or 'none detected'}"
+        yield f"\n- Files: {self.total_files}  |  Lines: {self.total_lines}"
         if self.entry_points:
-            lines.append(f"- Entry points: {', '.join(self.entry_points)}")
+            yield f"\n- Entry points: {', '.join(self.entry_points)}"
         if self.test_directories:
-            lines.append(f"- Test dirs: {', '.join(self.test_directories)}")
+            yield f"\n- Test dirs: {', '.join(self.test_directories)}"
         if self.has_ci:
-            lines.append(f"- CI: {self.ci_system or 'detected'}")
-        lines.append(f"- README: {'yes' if self.has_readme else 'no'}")
-        lines.append(f"- CONTRIBUTING: {'yes' if self.has_contributing else 'no'}")
+            yield f"\n- CI: {self.ci_system or 'detected'}"
+        yield f"\n- README: {'yes' if self.has_readme else 'no'}"
+        yield f"\n- CONTRIBUTING: {'yes' if self.has_contributing else 'no'}"
         if self.directory_tree:
-            lines += ["", "```", self.directory_tree, "```"]
-        return "\n".join(lines)
+            yield "\n\n```\n"
+            yield self.directory_tree
+            yield "\n```"
 
 
 # ---------------------------------------------------------------------------
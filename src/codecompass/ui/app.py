@@ -263,12 +263,30 @@ class CodeCompassApp(App[None]):
         )
         await self._compass_client.start()
 
-        sys_msg = self._agent.system_message("onboarding") if self._agent else None
+        sys_msg = self._system_message()
         await self._compass_client.create_session(
             system_message=sys_msg,
             streaming=True,
         )
 
+    def _system_message(self) -> dict[str, str] | None:
+        """Return the onboarding system message, or None if unavailable.
+
+        An oversized prompt is reported as a notification and the session
+        falls back to running without repository context.
+        """
+        if self._agent is None:
+            return None
+        try:
+            return self._agent.system_message("onboarding")
+        except ValueError as exc:
+            self.notify(
+                f"{exc}. Raise CODECOMPASS_MAX_PROMPT_CHARS to allow a larger prompt.",
+                title="System prompt too large",
+                severity="error",
+            )
+            return None
+
     # ── Input handling ───────────────────────────────────────────────
 
     async def on_input_submitted(self, event: Input.Submitted) -> None:
@@ -371,11 +389,7 @@ class CodeCompassApp(App[None]):
         self.action_clear_chat()
         if self._compass_client:
             try:
-                sys_msg = (
-                    self._agent.system_message("onboarding")
-                    if self._agent
-                    else None
-                )
+                sys_msg = self._system_message()
                 await self._compass_client.create_session(
                     system_message=sys_msg,
                     streaming=True,
@@ -448,15 +462,9 @@ class CodeCompassApp(App[None]):
             if model_changed and self._compass_client:
                 status.update(f"🔄 Switching model to {model}…")
                 try:
-                    await self._compass_client.stop()
-                    self._compass_client._model = model
-                    await self._compass_client.start()
-                    sys_msg = (
-                        self._agent.system_message("onboarding")
-                        if self._agent
-                        else None
-                    )
-                    await self._compass_client.create_session(
+                    sys_msg = self._system_message()
+                    await self._compass_client.switch_model(
+                        model,
                         system_message=sys_msg,
                         streaming=True,
                     )
@@ -0,0 +1,100 @@
+"""On-disk cache for expensive repository analysis results.
+
+Entries are pickled per repository under the user cache directory and
+keyed by a caller-supplied string (typically the ``HEAD`` SHA).  Storing
+a new entry removes older entries of the same name, so the cache holds
+at most one generation per artifact.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def cache_dir() -> Path:
+    """Return the OS-appropriate cache directory for CodeCompass.
+
+    Linux: ``$XDG_CACHE_HOME/codecompass`` or ``~/.cache/codecompass``
+    macOS: ``~/Library/Caches/codecompass``
+    Windows: ``%LOCALAPPDATA%\\codecompass\\cache``
+    """
+    if os.name == "nt":
+        local = os.environ.get("LOCALAPPDATA")
+        base = Path(local).resolve() if local else (Path.home() / "AppData" / "Local")
+        return base / "codecompass" / "cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "codecompass"
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg).resolve() if xdg else (Path.home() / ".cache")
+    return base / "codecompass"
+
+
+def repo_cache_dir(repo_path: str | Path) -> Path:
+    """Return the cache directory dedicated to *repo_path*."""
+    digest = hashlib.sha1(str(Path(repo_path).resolve()).encode("utf-8")).hexdigest()
+    return cache_dir() / digest[:16]
+
+
+def load_cached(repo_path: str | Path, name: str, key: str) -> Any | None:
+    """Load the cached *name* artifact for *repo_path* stored under *key*.
+
+    Returns:
+        The unpickled object, or ``None`` on a miss or unreadable entry.
+    """
+    path = repo_cache_dir(repo_path) / f"{name}-{key}.pkl"
+    try:
+        with open(path, "rb") as fh:
+            return pickle.load(fh)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        logger.debug("Ignoring unreadable cache entry %s: %s", path, exc)
+        return None
+
+
+def store_cached(repo_path: str | Path, name: str, key: str, value: Any) -> None:
+    """Atomically store *value* as the *name* artifact for *repo_path*.
+
+    Older entries of the same *name* are removed.  Failures are logged
+    and swallowed — the cache is purely an optimisation.
+    """
+    directory = repo_cache_dir(repo_path)
+    target = directory / f"{name}-{key}.pkl"
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, target)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        for stale in directory.glob(f"{name}-*.pkl"):
+            if stale != target:
+                stale.unlink(missing_ok=True)
+    except (OSError, pickle.PicklingError) as exc:
+        logger.debug("Could not write cache entry %s: %s", target, exc)
+
+
+def clear_cache(repo_path: str | Path | None = None) -> bool:
+    """Remove the cached artifacts for *repo_path*, or for every repo.
+
+    Returns:
+        ``True`` if a cache directory existed and was removed.
+    """
+    directory = repo_cache_dir(repo_path) if repo_path is not None else cache_dir()
+    if not directory.is_dir():
+        return False
+    shutil.rmtree(directory, ignore_errors=True)
+    return True
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import functools
 import os
+import stat
 import sys
 from pathlib import Path
 from typing import Any
@@ -40,6 +42,10 @@ class Settings(BaseModel):
         description="Max depth for the generated directory-tree view",
     )
     log_level: str = Field(default="WARNING", description="Logging level")
+    parallel_index: bool = Field(
+        default=False,
+        description="Build the knowledge graph across worker processes",
+    )
 
     # ----- class methods ----
 
@@ -69,13 +75,10 @@ class Settings(BaseModel):
 
         # 1 — Global config (lowest precedence among config files)
         global_cfg = Path(global_path).resolve() if global_path else global_config_path()
-        if global_cfg.is_file():
-            values.update(_parse_toml(global_cfg))
+        values.update(_load_toml(global_cfg))
 
         # 2 — Repo/local config overrides global
-        cfg_path = config_path(effective_base)
-        if cfg_path.is_file():
-            values.update(_parse_toml(cfg_path))
+        values.update(_load_toml(config_path(effective_base)))
 
         # 3 — Environment variables (prefixed CODECOMPASS_)
         env_map: dict[str, str] = {
@@ -85,6 +88,7 @@ class Settings(BaseModel):
             "CODECOMPASS_MAX_FILE_SIZE_KB": "max_file_size_kb",
             "CODECOMPASS_TREE_DEPTH": "tree_depth",
             "CODECOMPASS_LOG_LEVEL": "log_level",
+            "CODECOMPASS_PARALLEL_INDEX": "parallel_index",
         }
         for env_key, field_name in env_map.items():
             env_val = os.environ.get(env_key)
@@ -166,6 +170,7 @@ def write_config(
     lines.append("")
 
     target.write_text("\n".join(lines), encoding="utf-8")
+    _parse_toml_cached.cache_clear()
     return target
 
 
@@ -186,9 +191,7 @@ def update_config_key(key: str, value: str, path: str | Path | None = None) -> P
     target = Path(path) if path else config_path()
     target.parent.mkdir(parents=True, exist_ok=True)
 
-    existing: dict[str, Any] = {}
-    if target.is_file():
-        existing = _parse_toml(target)
+    existing = _load_toml(target)
 
     # Coerce numeric values
     if key in ("tree_depth", "max_file_size_kb"):
@@ -196,6 +199,8 @@ def update_config_key(key: str, value: str, path: str | Path | None = None) -> P
             existing[key] = int(value)
         except ValueError:
             existing[key] = value
+    elif key == "parallel_index":
+        existing[key] = value.strip().lower() in {"1", "true", "yes", "on"}
     else:
         existing[key] = value
 
@@ -211,9 +216,31 @@ def update_config_key(key: str, value: str, path: str | Path | None = None) -> P
     lines.append("")
 
     target.write_text("\n".join(lines), encoding="utf-8")
+    _parse_toml_cached.cache_clear()
     return target
 
 
+def _load_toml(path: Path) -> dict[str, Any]:
+    """Return the settings in the TOML file *path*, or ``{}`` if it is missing.
+
+    Parses are memoized on the file's mtime and size, so loading the
+    settings and then running ``config show`` reads each file once.
+    The result is a fresh dict that callers may modify.
+    """
+    try:
+        st = path.stat()
+    except OSError:
+        return {}
+    if not stat.S_ISREG(st.st_mode):
+        return {}
+    return dict(_parse_toml_cached(str(path), st.st_mtime_ns, st.st_size))
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_toml_cached(path: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    return _parse_toml(Path(path))
+
+
 def _parse_toml(path: Path) -> dict[str, Any]:
     """Parse a TOML config file and return a flat dict of settings.
 
@@ -0,0 +1,15 @@
+"""Shared pytest fixtures."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep analysis caches written by tests out of the real user cache."""
+    directory = tmp_path / "cache"
+    monkeypatch.setattr("codecompass.utils.cache.cache_dir", lambda: directory)
+    return directory
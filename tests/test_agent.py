@@ -0,0 +1,57 @@
+"""Tests for CodeCompassAgent payload builders."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from codecompass.agent.agent import AgentMode, CodeCompassAgent
+from codecompass.utils.config import Settings
+
+
+def test_audit_docs_lists_root_and_nested_docs(tmp_path: Path) -> None:
+    (tmp_path / "README.md").write_text("# Readme\n")
+    (tmp_path / "GUIDE.RST").write_text("Guide\n")
+    (tmp_path / "main.py").write_text("print('hi')\n")
+    (tmp_path / "docs" / "api").mkdir(parents=True)
+    (tmp_path / "docs" / "index.md").write_text("# Docs\n")
+    (tmp_path / "docs" / "api" / "client.md").write_text("# Client\n")
+    (tmp_path / "docs" / "api" / "notes.txt").write_text("skip\n")
+
+    agent = CodeCompassAgent(tmp_path, settings=Settings())
+    content = asyncio.run(agent.audit_docs())["user_message"]["content"]
+    doc_section = content.split("## Repo Summary")[0]
+
+    for expected in ("- README.md", "- GUIDE.RST", "- docs/index.md", "- docs/api/client.md"):
+        assert expected in doc_section
+    assert "notes.txt" not in doc_section
+    assert "main.py" not in doc_section
+
+
+def test_audit_docs_without_docs(tmp_path: Path) -> None:
+    (tmp_path / "main.py").write_text("print('hi')\n")
+
+    agent = CodeCompassAgent(tmp_path, settings=Settings())
+    content = asyncio.run(agent.audit_docs())["user_message"]["content"]
+
+    assert "- (no documentation files found)" in content
+
+
+def test_explore_architecture_lists_modules(tmp_path: Path) -> None:
+    (tmp_path / "app.py").write_text("import json\nimport os\n")
+
+    agent = CodeCompassAgent(tmp_path, settings=Settings())
+    content = asyncio.run(agent.explore_architecture())["user_message"]["content"]
+
+    assert content.startswith("Please analyze the architecture of this repository.\n\n")
+    assert "## Indexed Modules\n\n- app\n- json\n- os\n\n" in content
+    assert content.endswith("Total import edges: 2")
+
+
+def test_ask_selects_why_mode(tmp_path: Path) -> None:
+    agent = CodeCompassAgent(tmp_path, settings=Settings())
+    why = asyncio.run(agent.ask("  Why? does this exist"))
+    plain = asyncio.run(agent.ask("whyever not"))
+
+    assert why["system_message"] == agent.system_message(AgentMode.WHY)
+    assert plain["system_message"] == agent.system_message(AgentMode.ASK)
@@ -0,0 +1,122 @@
+"""Tests for the on-disk analysis cache."""
+
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import threading
+from pathlib import Path
+
+import pytest
+
+from codecompass.agent.agent import CodeCompassAgent
+from codecompass.utils.cache import clear_cache, load_cached, repo_cache_dir, store_cached
+from codecompass.utils.config import Settings
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture()
+def repo(tmp_path: Path) -> Path:
+    root = tmp_path / "repo"
+    (root / "pkg").mkdir(parents=True)
+    (root / "pkg" / "__init__.py").write_text("import os\n")
+    (root / "pkg" / "core.py").write_text("def run():\n    return 1\n")
+    _git(root, "init", "-q")
+    _git(root, "add", ".")
+    _git(root, "commit", "-q", "-m", "init")
+    return root
+
+
+def test_store_and_load_round_trip(tmp_path: Path) -> None:
+    store_cached(tmp_path, "thing", "k1", {"a": 1})
+    assert load_cached(tmp_path, "thing", "k1") == {"a": 1}
+    assert load_cached(tmp_path, "thing", "k2") is None
+
+
+def test_store_replaces_previous_generation(tmp_path: Path) -> None:
+    store_cached(tmp_path, "thing", "old", 1)
+    store_cached(tmp_path, "thing", "new", 2)
+    assert load_cached(tmp_path, "thing", "old") is None
+    assert [p.name for p in repo_cache_dir(tmp_path).glob("thing-*.pkl")] == ["thing-new.pkl"]
+
+
+def test_agent_reuses_cached_scan_on_clean_checkout(
+    repo: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    first = CodeCompassAgent(repo, settings=Settings())
+    summary = first.summary
+    assert first.graph.dependencies("pkg") == {"os"}
+
+    def _fail(*_args, **_kwargs):
+        raise AssertionError("expected a cache hit")
+
+    monkeypatch.setattr("codecompass.agent.agent.RepoScanner.scan", _fail)
+    monkeypatch.setattr("codecompass.agent.agent.KnowledgeGraph.build", _fail)
+
+    second = CodeCompassAgent(repo, settings=Settings())
+    assert second.summary == summary
+    assert second.graph.dependencies("pkg") == {"os"}
+
+
+def test_agent_skips_cache_on_dirty_checkout(repo: Path) -> None:
+    (repo / "pkg" / "new.py").write_text("y = 2\n")
+    agent = CodeCompassAgent(repo, settings=Settings())
+    assert agent._repo_cache_key() is None
+    assert agent.summary.total_files == 3
+    assert not repo_cache_dir(repo).exists()
+
+
+def test_system_message_is_memoized_per_mode(repo: Path) -> None:
+    agent = CodeCompassAgent(repo, settings=Settings())
+    onboarding = agent.system_message("onboarding")
+    assert agent.system_message("onboarding") is onboarding
+    assert "Repository Context" in onboarding["content"]
+    assert agent.system_message("why") is not onboarding
+
+
+def test_clear_cache_removes_one_repo_or_all(tmp_path: Path, isolated_cache: Path) -> None:
+    one, two = tmp_path / "one", tmp_path / "two"
+    store_cached(one, "thing", "k", 1)
+    store_cached(two, "thing", "k", 2)
+
+    assert clear_cache(one) is True
+    assert load_cached(one, "thing", "k") is None
+    assert load_cached(two, "thing", "k") == 2
+    assert clear_cache(one) is False
+
+    assert clear_cache() is True
+    assert load_cached(two, "thing", "k") is None
+    assert not isolated_cache.exists()
+
+
+def test_scan_returns_before_graph_and_onboard_joins_it(
+    repo: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    agent = CodeCompassAgent(repo, settings=Settings())
+    release = threading.Event()
+    original = CodeCompassAgent._ensure_graph
+
+    def _blocked_ensure_graph(self):
+        assert release.wait(5)
+        return original(self)
+
+    monkeypatch.setattr(CodeCompassAgent, "_ensure_graph", _blocked_ensure_graph)
+
+    async def _flow() -> bool:
+        summary = await agent.scan()
+        built_early = agent._graph is not None
+        release.set()
+        assert await agent.onboard() is summary
+        return built_early
+
+    assert asyncio.run(_flow()) is False
+    assert agent._graph_build is None
+    assert agent.graph.dependencies("pkg") == {"os"}
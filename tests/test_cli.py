@@ -1,11 +1,21 @@
 """Tests for the CLI entry point."""
 
+import asyncio
+import io
+import json
 import os
+import sys
 import tempfile
+import threading
 from pathlib import Path
 
+import copilot
+import pytest
 from click.testing import CliRunner
+from codecompass import cli
+from codecompass.agent.agent import CodeCompassAgent
 from codecompass.cli import main
+from codecompass.utils.config import Settings
 
 
 runner = CliRunner()
@@ -33,6 +43,15 @@ class TestCLI:
         # Should print the summary panel
         assert "CodeCompass" in result.output or "python" in result.output.lower()
 
+    def test_chat_reports_oversized_prompt(self, monkeypatch) -> None:
+        from codecompass.agent import prompts
+
+        monkeypatch.setattr(prompts, "MAX_PROMPT_CHARS", 10)
+        result = runner.invoke(main, ["--repo", ".", "chat", "-y"])
+        assert result.exit_code == 0
+        assert "Error:" in result.output
+        assert "CODECOMPASS_MAX_PROMPT_CHARS" in result.output
+
     def test_contributors(self) -> None:
         result = runner.invoke(main, ["--repo", ".", "contributors"])
         assert result.exit_code == 0
@@ -43,6 +62,32 @@ class TestCLI:
         assert result.exit_code == 0
         assert "Commands:" in result.output or "onboard" in result.output
 
+    def test_onboard_without_ai_skips_graph_build(self, tmp_path, monkeypatch) -> None:
+        def _fail(self):
+            raise AssertionError("graph should not be built")
+
+        monkeypatch.setattr(CodeCompassAgent, "_ensure_graph", _fail)
+        (tmp_path / "a.py").write_text("import os\n")
+        result = runner.invoke(main, ["--repo", str(tmp_path), "onboard", "--no-ai"])
+        assert result.exit_code == 0, result.output
+
+    def test_graph_text_detects_project_package(self, tmp_path) -> None:
+        pkg = tmp_path / "pkg"
+        pkg.mkdir()
+        (pkg / "__init__.py").write_text("")
+        (pkg / "a.py").write_text("import pkg.c\nimport os\n")
+        (pkg / "b.py").write_text("from pkg import c\n")
+        (pkg / "c.py").write_text("")
+        (tmp_path / "tests").mkdir()
+        (tmp_path / "tests" / "test_a.py").write_text("import pkg.a\n")
+
+        result = runner.invoke(main, ["--repo", str(tmp_path), "graph", "-f", "text"])
+        assert result.exit_code == 0
+        assert "Could not detect" not in result.output
+        assert "pkg.a:\n  → pkg.c" in result.output
+        assert "tests" not in result.output
+        assert "os" not in result.output.split()
+
 
 class TestConfigCommands:
     """Tests for the config subcommands."""
@@ -226,3 +271,171 @@ class TestConfigCommands:
             content = cfg.read_text()
             assert "new-model" in content
             assert "old" not in content
+
+    def test_config_set_parallel_index_bool(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = runner.invoke(main, ["--repo", tmpdir, "config", "set", "parallel_index", "true"])
+            assert result.exit_code == 0
+            content = (Path(tmpdir) / ".codecompass.toml").read_text()
+            assert "parallel_index = true" in content
+
+
+class TestCliHelpers:
+    """Tests for the CLI's internal helpers."""
+
+    def test_fetch_commit_diffs_keeps_order_and_errors(self) -> None:
+        class _FakeGit:
+            def diff(self, ref_a: str, ref_b: str) -> str:
+                if ref_b == "bad":
+                    raise RuntimeError("no parent")
+                return f"{ref_a}..{ref_b}"
+
+        log = [{"hash": "aaa"}, {"hash": "bad"}, {"hash": "ccc"}]
+        diffs = asyncio.run(cli._fetch_commit_diffs(_FakeGit(), log))
+        assert diffs[0] == "aaa~1..aaa"
+        assert isinstance(diffs[1], RuntimeError)
+        assert diffs[2] == "ccc~1..ccc"
+
+    def test_compass_session_cancels_graph_build_when_start_fails(
+        self, monkeypatch, tmp_path: Path
+    ) -> None:
+        from codecompass.agent.client import CompassClient
+
+        release = threading.Event()
+
+        async def _failing_start(self) -> None:
+            raise RuntimeError("no copilot")
+
+        monkeypatch.setattr(cli, "_init_git", lambda _path: None)
+        monkeypatch.setattr(cli, "_build_graph", lambda *_args: release.wait(5))
+        monkeypatch.setattr(CompassClient, "start", _failing_start)
+
+        async def _flow() -> set:
+            try:
+                with pytest.raises(RuntimeError, match="no copilot"):
+                    async with cli._compass_session(tmp_path, Settings(), {}):
+                        pass
+                return asyncio.all_tasks() - {asyncio.current_task()}
+            finally:
+                release.set()
+
+        assert asyncio.run(_flow()) == set()
+
+    def test_interactive_session_propagates_cancellation(
+        self, monkeypatch, tmp_path: Path
+    ) -> None:
+        import contextlib
+
+        @contextlib.asynccontextmanager
+        async def _fake_session(*_args, **_kwargs):
+            yield object()
+
+        async def _cancelled_read(_prompt: str) -> str:
+            raise asyncio.CancelledError
+
+        monkeypatch.setattr(cli, "_compass_session", _fake_session)
+        monkeypatch.setattr(cli, "_github_token_status", lambda _settings: (True, "set"))
+        monkeypatch.setattr(cli, "_read_line", _cancelled_read)
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(cli._interactive_session(tmp_path, Settings(), {}))
+
+    def test_delta_writer_coalesces_until_newline(self, monkeypatch) -> None:
+        stream = io.StringIO()
+        monkeypatch.setattr(cli.sys, "stdout", stream)
+        monkeypatch.setattr(cli.time, "monotonic", lambda: 0.0)
+
+        writer = cli._DeltaWriter()
+        writer.write("Hel")
+        writer.write("lo")
+        assert stream.getvalue() == ""
+        writer.write(" world\n")
+        assert stream.getvalue() == "Hello world\n"
+        writer.write("tail")
+        writer.flush()
+        assert stream.getvalue() == "Hello world\ntail"
+
+    def test_delta_writer_timer_flushes_stalled_tail(self, monkeypatch) -> None:
+        stream = io.StringIO()
+        monkeypatch.setattr(cli.sys, "stdout", stream)
+
+        async def _flow() -> tuple[str, str]:
+            writer = cli._DeltaWriter(asyncio.get_running_loop())
+            writer.write("partial")
+            before = stream.getvalue()
+            await asyncio.sleep(writer._FLUSH_INTERVAL * 3)
+            return before, stream.getvalue()
+
+        assert asyncio.run(_flow()) == ("", "partial")
+
+    def test_read_line_does_not_block_the_loop(self, monkeypatch) -> None:
+        release = threading.Event()
+
+        class _Console:
+            def input(self, prompt: str) -> str:
+                release.wait(5)
+                if prompt == "eof":
+                    raise EOFError
+                return "hello"
+
+        monkeypatch.setattr(cli, "_console", _Console)
+
+        async def _flow() -> tuple[str, bool]:
+            read = asyncio.ensure_future(cli._read_line("You: "))
+            await asyncio.sleep(0.01)
+            pending = not read.done()
+            release.set()
+            return await read, pending
+
+        assert asyncio.run(_flow()) == ("hello", True)
+        with pytest.raises(EOFError):
+            asyncio.run(cli._read_line("eof"))
+
+    def test_json_export_is_identical_with_and_without_orjson(self, tmp_path, monkeypatch) -> None:
+        pytest.importorskip("orjson")
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        (repo / "a.py").write_text("import os\n\ndef alpha():\n    pass\n")
+        agent = CodeCompassAgent(repo, settings=Settings())
+
+        fast, plain = tmp_path / "fast.json", tmp_path / "plain.json"
+        cli._export_onboarding(agent, agent.summary, str(fast), "json")
+        monkeypatch.setitem(sys.modules, "orjson", None)
+        cli._export_onboarding(agent, agent.summary, str(plain), "json")
+
+        assert json.loads(fast.read_bytes()) == json.loads(plain.read_text())
+        assert json.loads(plain.read_text())["modules"] == ["a", "os"]
+
+    def test_json_export_keeps_non_ascii_names(self, tmp_path, monkeypatch) -> None:
+        pytest.importorskip("orjson")
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        (repo / "café.py").write_text("import naïve\n\ndef grüße():\n    pass\n", encoding="utf-8")
+        agent = CodeCompassAgent(repo, settings=Settings())
+
+        fast, plain = tmp_path / "fast.json", tmp_path / "plain.json"
+        cli._export_onboarding(agent, agent.summary, str(fast), "json")
+        monkeypatch.setitem(sys.modules, "orjson", None)
+        cli._export_onboarding(agent, agent.summary, str(plain), "json")
+
+        assert fast.read_bytes() == plain.read_bytes()
+        assert "naïve" in plain.read_text(encoding="utf-8")
+
+    def test_model_listing_works_inside_running_loop(self, monkeypatch) -> None:
+        class _FakeCopilot:
+            async def start(self) -> None:
+                pass
+
+            async def stop(self) -> None:
+                pass
+
+            async def list_models(self) -> list[dict]:
+                return [{"id": "only-model", "billing": {"multiplier": 0}}]
+
+        monkeypatch.setattr(copilot, "CopilotClient", _FakeCopilot)
+
+        async def _inside_loop() -> list[tuple[str, str]]:
+            return cli._available_models_with_premium()
+
+        assert cli._available_models_with_premium() == [("only-model", "0x")]
+        assert asyncio.run(_inside_loop()) == [("only-model", "0x")]
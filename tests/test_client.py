@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import io
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import patch
@@ -34,7 +35,19 @@ def _build_client_with_session(session: _FakeSession) -> CompassClient:
     client = object.__new__(CompassClient)
     client._session = session
     client._active_request = None
-    client._request_lock = asyncio.Lock()
+    client._loop = None
+    client._pending = None
+    client._dispatcher = None
+    client._collector = {
+        "done": None,
+        "response_parts": io.StringIO(),
+        "full_response": [],
+        "error": None,
+        "timed_out": False,
+        "abandoned": False,
+        "token": None,
+        "on_delta": None,
+    }
     session.on(client._on_event)
     return client
 
@@ -113,7 +126,6 @@ def test_send_and_collect_raises_without_session() -> None:
     client = object.__new__(CompassClient)
     client._session = None
     client._active_request = None
-    client._request_lock = asyncio.Lock()
 
     try:
         asyncio.run(client.send_and_collect("q"))
@@ -123,16 +135,267 @@ def test_send_and_collect_raises_without_session() -> None:
 
 
 def test_send_and_collect_timeout_path() -> None:
-    session = _FakeSession([[ ]])
+    session = _FakeSession(
+        [
+            [],
+            [_Event("assistant.message", content="late ok"), _Event("session.idle")],
+        ]
+    )
+    client = _build_client_with_session(session)
+
+    async def _timeout_then_recover() -> str:
+        with patch("codecompass.agent.client._RESPONSE_TIMEOUT", 0.01):
+            try:
+                await client.send_and_collect("q")
+                assert False, "expected RuntimeError"
+            except RuntimeError as exc:
+                assert "timed out" in str(exc).lower()
+        return await client.send_and_collect("q2")
+
+    assert asyncio.run(_timeout_then_recover()) == "late ok"
+
+
+def test_send_reuses_collector_event_within_loop() -> None:
+    session = _FakeSession(
+        [
+            [_Event("assistant.message", content="one"), _Event("session.idle")],
+            [_Event("assistant.message", content="two"), _Event("session.idle")],
+        ]
+    )
     client = _build_client_with_session(session)
 
-    async def _raise_timeout(_awaitable, timeout):
-        _awaitable.close()
-        raise asyncio.TimeoutError()
+    async def _two_sends() -> tuple[str, str, bool]:
+        first = await client.send_and_collect("q1")
+        event = client._collector["done"]
+        second = await client.send_and_collect("q2")
+        return first, second, client._collector["done"] is event
+
+    first, second, reused = asyncio.run(_two_sends())
+
+    assert (first, second) == ("one", "two")
+    assert reused is True
+
+
+def test_send_and_collect_falls_back_to_streamed_deltas() -> None:
+    session = _FakeSession(
+        [
+            [
+                _Event("assistant.message_delta", delta_content="long "),
+                _Event("assistant.message_delta", delta_content="answer"),
+                _Event("session.idle"),
+            ],
+            [
+                _Event("assistant.message_delta", delta_content="short"),
+                _Event("session.idle"),
+            ],
+        ]
+    )
+    client = _build_client_with_session(session)
+
+    async def _two_sends() -> tuple[str, str]:
+        return await client.send_and_collect("q1"), await client.send_and_collect("q2")
+
+    assert asyncio.run(_two_sends()) == ("long answer", "short")
+
+
+def test_on_event_accepts_plain_string_event_types() -> None:
+    session = _FakeSession(
+        [[
+            SimpleNamespace(type="assistant.message", data=SimpleNamespace(content="plain")),
+            SimpleNamespace(type="session.idle", data=None),
+        ]]
+    )
+    client = _build_client_with_session(session)
+
+    assert asyncio.run(client.send_and_collect("q")) == "plain"
+
+
+class _CountingSession:
+    """Fake SDK session that keeps every registered listener."""
+
+    def __init__(self) -> None:
+        self.handlers: list = []
+
+    def on(self, handler) -> None:
+        self.handlers.append(handler)
+
+    async def send(self, _payload) -> None:
+        for handler in self.handlers:
+            handler(_Event("assistant.message", content="ok"))
+            handler(_Event("session.idle"))
+
+
+def test_listener_registered_once_across_many_sends() -> None:
+    session = _CountingSession()
+
+    class _FakeSdkClient:
+        async def create_session(self, _config):
+            return session
+
+    client = _build_client_with_session(_FakeSession([]))
+    client._client = _FakeSdkClient()
+    client._session = None
+    client._model = "gpt-4.1"
+    client._tools = []
+
+    async def _chat() -> list[str]:
+        await client.create_session()
+        return [await client.send_and_collect(f"q{i}") for i in range(100)]
+
+    replies = asyncio.run(_chat())
+
+    assert replies == ["ok"] * 100
+    assert len(session.handlers) == 1
+
+
+def test_concurrent_sends_are_dispatched_in_order() -> None:
+    sent: list[str] = []
+
+    class _DeferredSession:
+        def __init__(self) -> None:
+            self._handler = None
+
+        def on(self, handler) -> None:
+            self._handler = handler
+
+        async def send(self, payload) -> None:
+            prompt = payload["prompt"]
+            sent.append(prompt)
+            loop = asyncio.get_running_loop()
+            loop.call_soon(self._handler, _Event("assistant.message", content=f"re:{prompt}"))
+            loop.call_soon(self._handler, _Event("session.idle"))
+
+    client = _build_client_with_session(_DeferredSession())
+
+    async def _burst() -> list[str]:
+        return list(await asyncio.gather(*(client.send_and_collect(f"q{i}") for i in range(5))))
+
+    assert asyncio.run(_burst()) == [f"re:q{i}" for i in range(5)]
+    assert sent == [f"q{i}" for i in range(5)]
+
+
+def test_cancelled_send_releases_dispatcher_for_next_prompt() -> None:
+    aborted: list[bool] = []
+
+    class _SilentFirstSession:
+        def __init__(self) -> None:
+            self._handler = None
+
+        def on(self, handler) -> None:
+            self._handler = handler
+
+        async def send(self, payload) -> None:
+            if payload["prompt"] == "stuck":
+                return  # never answers
+            loop = asyncio.get_running_loop()
+            loop.call_soon(self._handler, _Event("assistant.message", content="fast"))
+            loop.call_soon(self._handler, _Event("session.idle"))
+
+        async def abort(self) -> None:
+            aborted.append(True)
+
+    client = _build_client_with_session(_SilentFirstSession())
+
+    async def _flow() -> str:
+        stuck = asyncio.ensure_future(client.send_and_collect("stuck"))
+        await asyncio.sleep(0)
+        follow_up = asyncio.ensure_future(client.send_and_collect("next"))
+        await asyncio.sleep(0.01)
+        stuck.cancel()
+        return await asyncio.wait_for(follow_up, 1)
+
+    assert asyncio.run(_flow()) == "fast"
+    assert aborted == [True]
+
+
+def test_stop_settles_queued_prompts() -> None:
+    class _SilentSession:
+        def on(self, handler) -> None:
+            pass
+
+        async def send(self, payload) -> None:
+            return  # never answers
+
+        async def destroy(self) -> None:
+            pass
+
+    client = _build_client_with_session(_SilentSession())
+    client._client = None
+
+    async def _flow() -> list[BaseException]:
+        sends = [asyncio.ensure_future(client.send_and_collect(p)) for p in ("a", "b", "c")]
+        await asyncio.sleep(0.01)
+        await asyncio.wait_for(client.stop(), 1)
+        done, _ = await asyncio.wait(sends, timeout=1)
+        assert len(done) == 3
+        return [s.exception() if not s.cancelled() else asyncio.CancelledError() for s in sends]
+
+    outcomes = asyncio.run(_flow())
+    # "a" was in flight; "b" sat in the queue and "c" was blocked putting it
+    assert isinstance(outcomes[0], asyncio.CancelledError)
+    assert [str(exc) for exc in outcomes[1:]] == ["Client stopped", "Client stopped"]
+
+
+def test_switch_model_replaces_session_without_restarting_client() -> None:
+    destroyed: list[object] = []
+
+    class _Session:
+        def on(self, _handler) -> None:
+            pass
+
+        async def destroy(self) -> None:
+            destroyed.append(self)
+
+    class _SdkClient:
+        def __init__(self) -> None:
+            self.configs: list[dict] = []
+
+        async def create_session(self, config: dict) -> _Session:
+            self.configs.append(config)
+            return _Session()
+
+    old_session = _Session()
+    client = _build_client_with_session(_FakeSession([]))
+    client._session = old_session
+    client._client = sdk = _SdkClient()
+    client._model = "gpt-4.1"
+    client._tools = []
+
+    new_session = asyncio.run(
+        client.switch_model("o4-mini", system_message={"content": "sys"})
+    )
+
+    assert client._client is sdk
+    assert destroyed == [old_session]
+    assert client._session is new_session
+    assert sdk.configs[0]["model"] == "o4-mini"
+    assert sdk.configs[0]["system_message"] == {"content": "sys"}
+
+
+def test_tools_built_once_with_attached_graph(tmp_path: Path) -> None:
+    class _Session:
+        def on(self, _handler) -> None:
+            pass
+
+        async def destroy(self) -> None:
+            pass
+
+    class _SdkClient:
+        async def create_session(self, config: dict) -> _Session:
+            return _Session()
+
+    client = CompassClient(tmp_path)
+    client._client = _SdkClient()
+    kg = object()
+
+    async def _sessions() -> None:
+        await client.create_session()
+        await client.create_session()
+
+    with patch("codecompass.agent.client.build_tools", return_value=["tool"]) as build:
+        client.attach_knowledge_graph(kg)
+        asyncio.run(_sessions())
 
-    with patch("codecompass.agent.client.asyncio.wait_for", side_effect=_raise_timeout):
-        try:
-            asyncio.run(client.send_and_collect("q"))
-            assert False, "expected RuntimeError"
-        except RuntimeError as exc:
-            assert "timed out" in str(exc).lower()
+    assert client._tools == ["tool"]
+    build.assert_called_once()
+    assert build.call_args.kwargs["knowledge_graph"] is kg
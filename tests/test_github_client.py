@@ -0,0 +1,71 @@
+"""Tests for the GitHub REST client."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+from codecompass.github import client as github_client
+from codecompass.github.client import GitHubClient
+
+
+def _client_with_transport(handler) -> GitHubClient:
+    client = GitHubClient(owner="octocat", repo="Hello-World", token="test")
+    client._client = httpx.AsyncClient(
+        base_url="https://api.github.com",
+        transport=httpx.MockTransport(handler),
+    )
+    return client
+
+
+def test_retries_once_after_retry_after() -> None:
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"}, text="slow down")
+        return httpx.Response(200, json={"number": 1})
+
+    client = _client_with_transport(handler)
+    assert asyncio.run(client.get_pr(1)) == {"number": 1}
+    assert calls == ["/repos/octocat/Hello-World/pulls/1"] * 2
+
+
+def test_long_rate_limit_wait_is_not_retried() -> None:
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(403, headers={"Retry-After": "3600"}, text="limited")
+
+    client = _client_with_transport(handler)
+    try:
+        asyncio.run(client.get_pr(1))
+        assert False, "expected GitHubClientError"
+    except github_client.GitHubClientError as exc:
+        assert "403" in str(exc)
+    assert len(calls) == 1
+
+
+def test_concurrent_requests_are_capped(monkeypatch) -> None:
+    monkeypatch.setattr(github_client, "_MAX_CONCURRENT_REQUESTS", 2)
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json=[])
+
+    client = _client_with_transport(handler)
+
+    async def _burst() -> None:
+        await asyncio.gather(*(client.get_pr_comments(n) for n in range(6)))
+
+    asyncio.run(_burst())
+    assert peak == 2
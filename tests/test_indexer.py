@@ -65,6 +65,19 @@ class TestRepoScanner:
 
         assert "CMakeLists.txt" in summary.config_files
 
+    def test_threaded_scan_matches_serial(self) -> None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        scanner = RepoScanner(REPO_ROOT)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            threaded = scanner.scan(executor=pool)
+        serial = scanner.scan()
+
+        assert threaded.total_files == serial.total_files
+        assert threaded.total_lines == serial.total_lines
+        assert threaded.entry_points == serial.entry_points
+        assert threaded.config_files == serial.config_files
+
 
 class TestKnowledgeGraph:
     """Tests for ``KnowledgeGraph``."""
@@ -127,3 +140,80 @@ class TestKnowledgeGraph:
         names_two = {s.name for s in kg.symbols.values()}
         assert "beta" in names_two
         assert "alpha" not in names_two
+
+    def test_parallel_build_matches_serial(self, kg: KnowledgeGraph) -> None:
+        from concurrent.futures import ProcessPoolExecutor
+
+        parallel = KnowledgeGraph()
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            parallel.build(REPO_ROOT, executor=pool)
+
+        assert parallel.symbols.keys() == kg.symbols.keys()
+        assert parallel.all_modules() == kg.all_modules()
+        assert len(parallel.imports) == len(kg.imports)
+        assert parallel.dependents("codecompass.models") == kg.dependents("codecompass.models")
+
+    def test_all_modules_is_memoized_until_rebuild(self, tmp_path: Path) -> None:
+        (tmp_path / "a.py").write_text("import os\n", encoding="utf-8")
+        kg = KnowledgeGraph()
+        kg.build(tmp_path)
+
+        first = kg.all_modules()
+        assert first == ["a", "os"]
+        assert kg.all_modules() is first
+        assert kg.import_count == 1
+
+        (tmp_path / "b.py").write_text("import sys\n", encoding="utf-8")
+        kg.build(tmp_path)
+        assert kg.all_modules() == ["a", "b", "os", "sys"]
+        assert kg.import_count == 2
+
+    def test_query_is_memoized_until_rebuild(self, tmp_path: Path) -> None:
+        (tmp_path / "a.py").write_text("def alpha():\n    pass\n", encoding="utf-8")
+        kg = KnowledgeGraph()
+        kg.build(tmp_path)
+
+        first = kg.query("Alpha")
+        assert [s.name for s in first] == ["alpha"]
+        assert kg.query("alpha") is first
+
+        (tmp_path / "b.py").write_text("def alphabet():\n    pass\n", encoding="utf-8")
+        kg.build(tmp_path)
+        assert sorted(s.name for s in kg.query("alpha")) == ["alpha", "alphabet"]
+
+    def test_query_summary_rows(self, tmp_path: Path) -> None:
+        (tmp_path / "a.py").write_text(
+            'class Alpha:\n    """' + "d" * 150 + '"""\n\ndef alpha_fn():\n    pass\n',
+            encoding="utf-8",
+        )
+        kg = KnowledgeGraph()
+        kg.build(tmp_path)
+
+        rows = kg.query_summary("alpha", 1)
+        assert len(rows) == 1
+        assert sorted(kg.query_summary("ALPHA", 5)) == [
+            ("class", "Alpha", 1, "a.py", "d" * 100),
+            ("function", "alpha_fn", 4, "a.py", ""),
+        ]
+        assert kg.query_summary("alpha", 1) is rows
+
+    def test_pickle_drops_query_memos_and_restores_missing_ones(self, tmp_path: Path) -> None:
+        import pickle
+
+        (tmp_path / "a.py").write_text("def alpha():\n    pass\n", encoding="utf-8")
+        kg = KnowledgeGraph()
+        kg.build(tmp_path)
+        kg.query_summary("alpha", 1)
+
+        restored = pickle.loads(pickle.dumps(kg))
+        assert restored._queries == {}
+        assert restored._summaries == {}
+        assert [s.name for s in restored.query("alpha")] == ["alpha"]
+
+        # A graph pickled before the memos existed
+        state = kg.__dict__.copy()
+        del state["_queries"], state["_summaries"]
+        old = KnowledgeGraph.__new__(KnowledgeGraph)
+        old.__setstate__(state)
+        assert [s.name for s in old.query("alpha")] == ["alpha"]
+        assert old.query_summary("alpha", 1) == [("function", "alpha", 1, "a.py", "")]
@@ -38,6 +38,19 @@ class TestModels:
         assert "flask" in text
         assert "Files: 10" in text
 
+    def test_repo_summary_to_text_iter_matches_to_text(self) -> None:
+        summary = RepoSummary(
+            name="test-repo",
+            root="/tmp/test",
+            entry_points=["main.py"],
+            has_ci=True,
+            directory_tree="src/\n  main.py",
+        )
+        chunks = list(summary.to_text_iter())
+        assert len(chunks) > 1
+        assert "".join(chunks) == summary.to_text()
+        assert summary.to_text().endswith("src/\n  main.py\n```")
+
     def test_symbol_node(self) -> None:
         sym = SymbolNode(
             name="MyClass",
@@ -141,3 +154,26 @@ class TestSettings:
         path = global_config_path()
         assert path.name == "config.toml"
         assert path.parent.name == "codecompass"
+
+    def test_config_file_parse_is_reused_until_written(self, tmp_path: Path) -> None:
+        from unittest.mock import patch
+
+        from codecompass.utils import config as config_mod
+
+        cfg = tmp_path / ".codecompass.toml"
+        cfg.write_text('[codecompass]\nmodel = "first"\n', encoding="utf-8")
+        config_mod._parse_toml_cached.cache_clear()
+        no_global = tmp_path / "no-global.toml"
+
+        with patch.object(config_mod, "_parse_toml", wraps=config_mod._parse_toml) as parse:
+            assert Settings.load(base_path=tmp_path, global_path=no_global).model == "first"
+            vals = config_mod._load_toml(cfg)
+            vals["model"] = "mutated"
+            assert config_mod._load_toml(cfg) == {"model": "first"}
+            assert parse.call_count == 1
+
+            config_mod.update_config_key("model", "other", cfg)
+            assert Settings.load(base_path=tmp_path, global_path=no_global).model == "other"
+
+        assert config_mod._load_toml(tmp_path / "missing.toml") == {}
+        assert config_mod._load_toml(tmp_path) == {}
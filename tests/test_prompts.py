@@ -0,0 +1,73 @@
+"""Tests for the system prompt builders."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from codecompass.agent.prompts import (
+    MAX_ONBOARDING_BATCH,
+    ONBOARDING_SYSTEM_PROMPT,
+    _max_prompt_chars,
+    get_onboarding_prompt,
+    get_onboarding_prompt_batch,
+)
+
+
+def test_onboarding_prompt_keeps_static_prefix_before_summary() -> None:
+    first = get_onboarding_prompt("repo one")["content"]
+    second = get_onboarding_prompt("another repo")["content"]
+
+    prefix = first[: -len("repo one")]
+    assert first.startswith(ONBOARDING_SYSTEM_PROMPT)
+    assert second == prefix + "another repo"
+    assert "## Repository Context" in prefix
+
+
+def test_onboarding_prompt_is_a_fresh_json_serializable_dict() -> None:
+    # The SDK json.dumps() the system message, so read-only mapping
+    # proxies are not an option; callers may also mutate their copy.
+    first = get_onboarding_prompt("summary")
+    second = get_onboarding_prompt("summary")
+
+    assert type(first) is dict
+    assert first is not second
+    assert json.loads(json.dumps(first)) == first
+
+
+def test_onboarding_prompt_reuses_content_for_same_summary() -> None:
+    first = get_onboarding_prompt("cached summary")
+    second = get_onboarding_prompt("cached summary")
+
+    assert first["content"] is second["content"]
+
+
+def test_onboarding_prompt_batch_labels_each_repo_once() -> None:
+    content = get_onboarding_prompt_batch(["alpha summary", "beta summary"])["content"]
+
+    assert content.startswith(ONBOARDING_SYSTEM_PROMPT)
+    assert content.count(ONBOARDING_SYSTEM_PROMPT) == 1
+    assert content.index("[repo1]\nalpha summary") < content.index("[repo2]\nbeta summary")
+    assert content.endswith("[repo1]..[repo2] in order.")
+
+
+@pytest.mark.parametrize("count", [0, MAX_ONBOARDING_BATCH + 1])
+def test_onboarding_prompt_batch_rejects_bad_sizes(count: int) -> None:
+    with pytest.raises(ValueError):
+        get_onboarding_prompt_batch(["summary"] * count)
+
+
+def test_oversized_summary_is_rejected_before_building(monkeypatch) -> None:
+    monkeypatch.setattr("codecompass.agent.prompts.MAX_PROMPT_CHARS", 100)
+
+    with pytest.raises(ValueError, match="CODECOMPASS_MAX_PROMPT_CHARS"):
+        get_onboarding_prompt("x" * 50)
+    with pytest.raises(ValueError):
+        get_onboarding_prompt_batch(["x"])
+
+
+@pytest.mark.parametrize(("raw", "expected"), [("1000", 1000), ("lots", 400_000), ("-5", 400_000)])
+def test_max_prompt_chars_env_falls_back_when_invalid(monkeypatch, raw: str, expected: int) -> None:
+    monkeypatch.setenv("CODECOMPASS_MAX_PROMPT_CHARS", raw)
+    assert _max_prompt_chars() == expected
@@ -2,12 +2,13 @@
 
 import asyncio
 import os
+import shutil
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from codecompass.agent.tools import build_tools
+from codecompass.agent.tools import _search_with_python, build_tools
 from codecompass.github.client import GitHubClient
 from codecompass.github.git import GitOps
 from codecompass.indexer.knowledge_graph import KnowledgeGraph
@@ -128,6 +129,23 @@ class TestSearchGitHistory:
         result = _call_tool_text(tool, query="xyznonexistent999")
         assert "No commits found" in result
 
+    def test_results_cached_until_head_moves(self, monkeypatch) -> None:
+        monkeypatch.setattr("codecompass.agent.tools._HEAD_CHECK_INTERVAL", 0)
+        git = MagicMock()
+        git.head_sha.return_value = "a" * 40
+        git.search_log.return_value = [
+            {"short_hash": "abc1234", "date": "2024-01-01", "author": "dev", "message": "fix"}
+        ]
+        tool = _get_tool(build_tools(REPO_ROOT, git_ops=git), "search_git_history")
+
+        first = _call_tool_text(tool, query="fix")
+        assert _call_tool_text(tool, query="fix") == first
+        assert git.search_log.call_count == 1
+
+        git.head_sha.return_value = "b" * 40
+        _call_tool_text(tool, query="fix")
+        assert git.search_log.call_count == 2
+
 
 class TestGetCommitFiles:
     """Integration tests for the get_commit_files tool."""
@@ -187,6 +205,47 @@ class TestReadSourceFile:
         result = _call_tool_text(tool, file_path="does_not_exist.py")
         assert "not found" in result.lower()
 
+    def test_read_runs_off_the_event_loop_thread(self, tmp_path, monkeypatch) -> None:
+        import threading
+
+        (tmp_path / "a.py").write_text("x = 1\n", encoding="utf-8")
+        threads: list[int] = []
+        original = Path.read_text
+
+        def _recording_read_text(self, *args, **kwargs):
+            threads.append(threading.get_ident())
+            return original(self, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "read_text", _recording_read_text)
+        tool = _get_tool(build_tools(tmp_path), "read_source_file")
+        assert "x = 1" in _call_tool_text(tool, file_path="a.py")
+        assert threads and threading.get_ident() not in threads
+
+    def test_read_truncation_counts_lines_like_splitlines(self, tmp_path) -> None:
+        (tmp_path / "plain.py").write_text("".join(f"x{i}\n" for i in range(301)), encoding="utf-8")
+        (tmp_path / "feed.py").write_text("a\fb\n" * 200, encoding="utf-8")
+        tool = _get_tool(build_tools(tmp_path), "read_source_file")
+
+        plain = _call_tool_text(tool, file_path="plain.py")
+        assert plain.startswith("File: plain.py (first 300 of 301 lines)")
+        assert "x299\n```" in plain and "x300" not in plain
+
+        feed = _call_tool_text(tool, file_path="feed.py")
+        assert feed.startswith("File: feed.py (first 300 of 400 lines)")
+
+    def test_read_large_file_is_truncated_with_total_count(self, tmp_path) -> None:
+        lines = [f"line {i:05d} " + "x" * 40 for i in range(1, 40_001)]
+        (tmp_path / "big.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+        tool = _get_tool(build_tools(tmp_path), "read_source_file")
+
+        result = _call_tool_text(tool, file_path="big.txt")
+        assert result.startswith("File: big.txt (first 300 of 40000 lines)")
+        assert lines[299] in result and lines[300] not in result
+
+        tail = _call_tool_text(tool, file_path="big.txt", start_line=39_999, end_line=50_000)
+        assert tail.startswith("File: big.txt (lines 39999-40000)")
+        assert tail.endswith(f"{lines[39_998]}\n{lines[39_999]}\n```")
+
 
 class TestSearchCode:
     """Integration tests for the search_code tool."""
@@ -208,6 +267,86 @@ class TestSearchCode:
         result = _call_tool_text(tool, query="class GitOps", file_pattern="*.py")
         assert "GitOps" in result
 
+    def test_search_without_ripgrep_falls_back(self, tools: list, monkeypatch) -> None:
+        monkeypatch.setattr("codecompass.agent.tools._rg_executable", lambda: None)
+        tool = _get_tool(tools, "search_code")
+        result = _call_tool_text(tool, query="class GitOps", file_pattern="*.py")
+        assert "`src/codecompass/github/git.py:22`: class GitOps:" in result
+
+    def test_fallback_walk_prunes_skipped_dirs(self, tmp_path) -> None:
+        for rel in ("pkg/mod.py", "pkg/notes.txt", "node_modules/dep/index.py", ".git/hook.py"):
+            path = tmp_path / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("needle\n", encoding="utf-8")
+
+        assert _search_with_python(tmp_path, "needle", "*.py", 10) == ["- `pkg/mod.py:1`: needle"]
+        assert _search_with_python(tmp_path, "needle", "pkg/*.txt", 10) == [
+            "- `pkg/notes.txt:1`: needle"
+        ]
+
+    def test_fallback_listing_rewalks_only_after_tree_changes(self, tmp_path, monkeypatch) -> None:
+        from codecompass.agent import tools as tools_mod
+
+        (tmp_path / "pkg" / "sub").mkdir(parents=True)
+        (tmp_path / "pkg" / "sub" / "a.py").write_text("token\n", encoding="utf-8")
+        assert _search_with_python(tmp_path, "token", "*.py", 10) == ["- `pkg/sub/a.py:1`: token"]
+
+        walks: list[Path] = []
+        original = tools_mod._RepoListing._walk
+
+        def _recording_walk(self):
+            walks.append(self.root)
+            original(self)
+
+        monkeypatch.setattr(tools_mod._RepoListing, "_walk", _recording_walk)
+        _search_with_python(tmp_path, "token", "*.py", 10)
+        assert walks == []
+
+        (tmp_path / "pkg" / "sub" / "b.py").write_text("token\n", encoding="utf-8")
+        assert len(_search_with_python(tmp_path, "token", "*.py", 10)) == 2
+        assert walks == [tmp_path]
+
+    def test_fallback_reports_each_matching_line_once(self, tmp_path) -> None:
+        (tmp_path / "m.py").write_text("x = 1\nFoo = foo\n\nfoo()", encoding="utf-8")
+        assert _search_with_python(tmp_path, "foo", "*.py", 10) == [
+            "- `m.py:2`: Foo = foo",
+            "- `m.py:4`: foo()",
+        ]
+        assert _search_with_python(tmp_path, "foo", "*.py", 1) == ["- `m.py:2`: Foo = foo"]
+
+    def test_fallback_sees_edited_file_contents(self, tmp_path) -> None:
+        (tmp_path / "a.py").write_text("alpha = 1\n")
+        (tmp_path / "b.py").write_text("beta = 2\n")
+        assert _search_with_python(tmp_path, "ALPHA", "*.py", 10) == ["- `a.py:1`: alpha = 1"]
+
+        (tmp_path / "b.py").write_text("beta = alpha\n")
+        assert "- `b.py:1`: beta = alpha" in _search_with_python(tmp_path, "alpha", "*.py", 10)
+
+    def test_fallback_stops_reading_once_enough_matches(self, tmp_path, monkeypatch) -> None:
+        from codecompass.agent import tools as tools_mod
+
+        count = tools_mod._SEARCH_BATCH * 3
+        for i in range(count):
+            (tmp_path / f"m{i:03}.py").write_text("token\n")
+
+        read: list[str] = []
+        original = Path.read_bytes
+
+        def _recording_read_bytes(self, *args, **kwargs):
+            read.append(self.name)
+            return original(self, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "read_bytes", _recording_read_bytes)
+        assert len(_search_with_python(tmp_path, "token", "*.py", 1)) == 1
+        assert len(read) == tools_mod._SEARCH_BATCH
+        assert len(_search_with_python(tmp_path, "token", "*.py", count)) == count
+
+    @pytest.mark.skipif(shutil.which("rg") is None, reason="ripgrep not installed")
+    def test_search_with_ripgrep_matches_fallback_format(self, tools: list) -> None:
+        tool = _get_tool(tools, "search_code")
+        result = _call_tool_text(tool, query="class GitOps:", file_pattern="*.py", max_results=1)
+        assert result.endswith("- `src/codecompass/github/git.py:22`: class GitOps:")
+
 
 class TestGetArchitectureSummary:
     """Integration tests for the get_architecture_summary tool."""
@@ -233,6 +372,26 @@ class TestFindRelatedDocs:
         result = _call_tool_text(tool, file_path="nonexistent_file.py")
         assert "not found" in result.lower()
 
+    def test_docs_listing_picks_up_nested_changes(self, tmp_path) -> None:
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "mod.py").write_text("", encoding="utf-8")
+        (tmp_path / "pkg" / "notes.rst").write_text("", encoding="utf-8")
+        (tmp_path / "pkg" / "README.md").write_text("", encoding="utf-8")
+        (tmp_path / "docs" / "guide").mkdir(parents=True)
+        (tmp_path / "docs" / "index.md").write_text("", encoding="utf-8")
+        tool = _get_tool(build_tools(tmp_path), "find_related_docs")
+
+        result = _call_tool_text(tool, file_path="pkg/mod.py")
+        assert result.splitlines()[2:] == [
+            "- `pkg/README.md`",
+            "- `pkg/notes.rst`",
+            "- `docs/index.md`",
+        ]
+
+        (tmp_path / "docs" / "guide" / "setup.md").write_text("", encoding="utf-8")
+        result = _call_tool_text(tool, file_path="pkg/mod.py")
+        assert "- `docs/guide/setup.md`" in result
+
 
 class TestDetectStaleDocs:
     """Integration tests for the detect_stale_docs tool."""
@@ -249,6 +408,37 @@ class TestDetectStaleDocs:
         assert isinstance(result, str)
         assert len(result) > 0
 
+    def test_detect_stale_reports_each_missing_ref_once(self, tmp_path) -> None:
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "app.py").write_text("", encoding="utf-8")
+        (tmp_path / "README.md").write_text(
+            "See `src/app.py`, `src/gone.py` and again `src/gone.py`.\n", encoding="utf-8"
+        )
+        (tmp_path / "NOTES.md").write_text("No code references here.\n", encoding="utf-8")
+
+        tool = _get_tool(build_tools(tmp_path), "detect_stale_docs")
+        result = _call_tool_text(tool)
+        assert "Found 1 potential documentation issue(s)" in result
+        assert "- **README.md**: References `src/gone.py` which does not exist" in result
+
+    def test_detect_stale_many_refs_uses_repo_file_set(self, tmp_path, monkeypatch) -> None:
+        monkeypatch.setattr("codecompass.agent.tools._STALE_REF_STAT_LIMIT", 2)
+        (tmp_path / "src").mkdir()
+        (tmp_path / "node_modules" / "dep").mkdir(parents=True)
+        (tmp_path / "node_modules" / "dep" / "index.js").write_text("", encoding="utf-8")
+        refs = [f"src/m{i}.py" for i in range(5)]
+        for ref in refs[:4]:
+            (tmp_path / ref).write_text("", encoding="utf-8")
+        (tmp_path / "README.md").write_text(
+            " ".join(f"`{ref}`" for ref in refs) + " `node_modules/dep/index.js`\n",
+            encoding="utf-8",
+        )
+
+        tool = _get_tool(build_tools(tmp_path), "detect_stale_docs")
+        result = _call_tool_text(tool)
+        assert "Found 1 potential documentation issue(s)" in result
+        assert "`src/m4.py` which does not exist" in result
+
 
 class TestGetSymbolInfo:
     """Integration tests for the get_symbol_info tool."""
@@ -576,6 +766,29 @@ class TestGetPRDetailsMocked:
         text = _call_tool_text(tool, query="zzz_nonexistent_zzz")
         assert "No pull requests found" in text
 
+    def test_pr_search_matches_body_and_respects_max_results(self, github_tools) -> None:
+        """Keyword search checks PR bodies and stops at max_results."""
+        tool = _get_tool(github_tools, "get_pr_details")
+        text = _call_tool_text(tool, query="the", max_results=1)
+        assert text.startswith("Found 1 PR(s) matching 'the'")
+        assert "#42" in text and "#10" not in text
+
+    def test_pr_search_does_not_match_across_title_and_body(self, github_tools) -> None:
+        tool = _get_tool(github_tools, "get_pr_details")
+        text = _call_tool_text(tool, query="XThis")
+        assert "No pull requests found" in text
+
+    def test_pr_search_reuses_listing_between_queries(self) -> None:
+        mock_client = MagicMock()
+        mock_client.list_prs = AsyncMock(return_value=[
+            {"number": 7, "title": "Straße cleanup", "state": "open", "body": None},
+        ])
+        tool = _get_tool(build_tools(REPO_ROOT, github_client=mock_client), "get_pr_details")
+
+        assert "#7" in _call_tool_text(tool, query="STRASSE")
+        assert "#7" in _call_tool_text(tool, query="cleanup")
+        assert mock_client.list_prs.await_count == 1
+
 
 class TestSearchIssuesMocked:
     """Tests for search_issues with a mocked GitHub client."""